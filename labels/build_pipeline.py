@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import argparse
+import textwrap
+from pathlib import Path
+
+from util.pylib import log
+
+from labels.pylib import pipeline
+
+
+def main():
+    log.started()
+    args = parse_args()
+
+    args.pipeline_dir.mkdir(parents=True, exist_ok=True)
+    pipeline.save(args.pipeline_dir, lean=args.lean)
+
+    log.finished()
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=textwrap.dedent(
+            """
+            Build the label parser and save it to a directory. Loading a saved
+            parser is much faster than building it from its rules and terms.
+
+            The saved parser is rebuilt on load when any of the rule or term
+            files change.
+            """,
+        ),
+    )
+
+    arg_parser.add_argument(
+        "--pipeline-dir",
+        metavar="PATH",
+        type=Path,
+        required=True,
+        help="""Save the parser to this directory.""",
+    )
+
+    arg_parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="""Save the lean parser used by parse-labels --lean.""",
+    )
+
+    args = arg_parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import textwrap
+from collections.abc import Callable
 from pathlib import Path
 
-from traiter.pylib.darwin_core import DarwinCore
 from util.pylib import log
 
+from labels.pylib.job_manifest import MANIFEST, JobManifest
+from labels.pylib.label import Label
 from labels.pylib.labels import Labels
+from labels.pylib.writers.json_writer import (
+    JsonLinesWriter,
+    JsonWriter,
+    TraiterArchiveWriter,
+    TraiterDirWriter,
+)
 from labels.pylib.writers.label_html_writer import HtmlWriter
+from labels.pylib.writers.parquet_writer import ParquetWriter
 
 
 def main():
@@ -16,52 +24,92 @@ def main():
     args = parse_args()
 
     labels: Labels = Labels(args)
-    labels.parse()
-    labels.filter(args.length_cutoff, args.score_cutoff)
 
-    if args.html_file:
-        writer = HtmlWriter(args.html_file, args.spotlight)
-        writer.write(labels, args)
+    writers = get_writers(args, labels)
 
-    if args.traiter_dir:
-        args.traiter_dir.mkdir(parents=True, exist_ok=True)
-        write_separate_files(labels, args.traiter_dir)
+    html_writer = HtmlWriter(args.html_file, args.spotlight) if args.html_file else None
+    metrics = labels.metrics
 
-    if args.json_output:
-        write_single_file(labels, args.json_output)
+    def write(lb):
+        with metrics.stage("dwc"):
+            lb.as_dwc()
+        if html_writer:
+            with metrics.stage("write/HtmlWriter"):
+                html_writer.add(lb)
+        for writer in writers:
+            with metrics.stage(f"write/{type(writer).__name__}"):
+                writer.write(lb)
 
-    log.finished()
-
-
-def write_single_file(labels, json_output):
-    records = []
+    if args.job_dir:
+        run_job(args, labels, write)
+    else:
+        for lb in labels.stream(args.length_cutoff, args.score_cutoff):
+            write(lb)
 
-    for lb in labels.labels:
-        rec = {
-            "image": lb.path.stem,
-            "word_count": lb.word_count,
-            "valid_words": lb.valid_words,
-            "score": lb.score,
-        }
+    labels.close()
 
-        dwc = DarwinCore()
-        _ = [t.to_dwc(dwc) for t in lb.traits]
-        rec |= dwc.to_dict()
+    with metrics.stage("write/close"):
+        for writer in writers:
+            writer.close()
 
-        records.append(rec)
+        if html_writer:
+            html_writer.write(labels, args)
 
-    with json_output.open("w") as f:
-        json.dump(records, f, indent=2)
+    write_reports(args, labels)
 
+    log.finished()
 
-def write_separate_files(labels, traiter_dir):
-    for lb in labels.labels:
-        dwc = DarwinCore()
-        _ = [t.to_dwc(dwc) for t in lb.traits]
 
-        path = traiter_dir / f"{lb.path.stem}.json"
-        with path.open("w") as f:
-            json.dump(dwc.to_dict(), f, indent=4)
+def write_reports(args, labels: Labels):
+    if labels.profiler:
+        labels.profiler.write(args.profile)
+
+    if labels.slow:
+        labels.slow.log()
+        labels.metrics.extra["slowest_labels"] = labels.slow.report()
+        if args.slow_report_file:
+            labels.slow.write(args.slow_report_file)
+
+    if args.metrics:
+        labels.metrics.extra["timed_out"] = labels.timed_out
+        labels.metrics.write()
+
+
+def run_job(args, labels: Labels, write: Callable[[Label], None]):
+    """Parse the labels shard by shard, then merge the shards into --json-output."""
+    manifest = JobManifest(args.job_dir, labels.paths, args.shard_size)
+
+    for shard in manifest.pending():
+        shard_writer = JsonLinesWriter(shard.output)
+        labels.paths = [p for p in shard.paths if p.stem not in shard_writer.done]
+        for lb in labels.stream(args.length_cutoff, args.score_cutoff):
+            write(lb)
+            with labels.metrics.stage("write/shard"):
+                shard_writer.write(lb)
+        shard_writer.close()
+        manifest.complete(shard)
+
+    with labels.metrics.stage("write/merge"):
+        manifest.merge(args.json_output)
+
+
+def get_writers(args, labels: Labels) -> list:
+    writers = []
+    # A job writes its own JSON output
+    json_output = None if args.job_dir else args.json_output
+    if json_output and json_output.suffix == ".jsonl":
+        writer = JsonLinesWriter(json_output)
+        labels.skip(writer.done)
+        writers.append(writer)
+    elif json_output:
+        writers.append(JsonWriter(json_output))
+    if args.parquet_output:
+        writers.append(ParquetWriter(args.parquet_output))
+    if args.traiter_dir and TraiterArchiveWriter.is_archive(args.traiter_dir):
+        writers.append(TraiterArchiveWriter(args.traiter_dir))
+    elif args.traiter_dir:
+        writers.append(TraiterDirWriter(args.traiter_dir))
+    return writers
 
 
 def parse_args() -> argparse.Namespace:
@@ -87,14 +135,34 @@ def parse_args() -> argparse.Namespace:
         metavar="PATH",
         type=Path,
         required=True,
-        help="""Directory containing the input text files.""",
+        help="""Directory containing the input text files. This may also be a .zip
+            or an uncompressed .tar archive of text files, a .jsonl file of
+            {"stem": ..., "text": ...} records, or a .csv manifest with a "path"
+            column of text files. Those are read without unpacking them or listing
+            a directory.""",
     )
 
     arg_parser.add_argument(
         "--json-output",
         metavar="PATH",
         type=Path,
-        help="""Output a JSON file holding traits.""",
+        help="""Output a JSON file holding traits. If the file name ends with
+            .jsonl then write JSON Lines, one record per label as soon as it is
+            parsed. A JSON Lines run resumes where the last one stopped: labels
+            already in the file are skipped. Delete the file to start over. Labels
+            are skipped for every output, so --traiter-dir only gets files for the
+            rest of the labels, and a resumed run cannot also write --parquet-output,
+            --html-file, or a --traiter-dir archive.""",
+    )
+
+    arg_parser.add_argument(
+        "--parquet-output",
+        metavar="PATH",
+        type=Path,
+        help="""Output a Parquet file holding the same records as --json-output, with
+            a column for every DwC term. labels.pylib.writers.parquet_writer has a
+            read_parquet() function that leaves out the empty ones. See
+            --json-output for resuming.""",
     )
 
     arg_parser.add_argument(
@@ -102,7 +170,8 @@ def parse_args() -> argparse.Namespace:
         metavar="PATH",
         type=Path,
         help="""Output JSON files holding traits, one for each input text file, in this
-            directory.""",
+            directory. If the name ends with .zip, .tar, .tar.gz, or .tgz then put the
+            files into that archive instead.""",
     )
 
     arg_parser.add_argument(
@@ -117,7 +186,10 @@ def parse_args() -> argparse.Namespace:
         metavar="PATH",
         type=Path,
         help="""Directory containing the images of labels or treatments.
-            These images are for HTML output.""",
+            These images are for HTML output. Images are found by the label's file
+            stem with a .jpg, .jpeg, .png, .tif, .tiff, .gif, .bmp, or .webp suffix,
+            in lower or upper case. Large runs list the directory once instead, and
+            keep that listing in --cache-dir.""",
     )
 
     arg_parser.add_argument(
@@ -138,6 +210,20 @@ def parse_args() -> argparse.Namespace:
             (default: %(default)s)""",
     )
 
+    arg_parser.add_argument(
+        "--filter-first",
+        action="store_true",
+        help="""Score labels and apply the length and score cutoffs before parsing
+            them. Labels that are removed are never parsed.""",
+    )
+
+    arg_parser.add_argument(
+        "--triage",
+        action="store_true",
+        help="""Look at each label's text first and skip groups of trait rules
+            (floral morphology, TRS/UTM, ID numbers) that cannot match it.""",
+    )
+
     arg_parser.add_argument(
         "--limit",
         type=int,
@@ -151,6 +237,132 @@ def parse_args() -> argparse.Namespace:
         help="""Offset for splitting data.""",
     )
 
+    arg_parser.add_argument(
+        "--job-dir",
+        metavar="PATH",
+        type=Path,
+        help="""Run the labels as a job that can resume after a crash. The sorted text
+            files (after --offset & --limit) are split into shards. Each shard's
+            output and a checkpoint of the finished shards are kept in this
+            directory. Running the same command again picks up where the last run
+            stopped. When every shard is done they are merged into --json-output.
+            Resuming works as it does for --json-output.""",
+    )
+
+    arg_parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=1000,
+        metavar="INT",
+        help="""How many labels go into each shard of a --job-dir run.
+            (default: %(default)s)""",
+    )
+
+    arg_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=128,
+        metavar="INT",
+        help="""How many labels to send through the parser at once.
+            (default: %(default)s)""",
+    )
+
+    arg_parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=256,
+        metavar="INT",
+        help="""Read up to this many label text files ahead of the parser on
+            background threads. This hides slow reads from network storage. Use 0
+            to read each file just before it is parsed. (default: %(default)s)""",
+    )
+
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="INT",
+        help="""Parse labels in this many processes. Each process builds its own
+            parser. (default: %(default)s)""",
+    )
+
+    arg_parser.add_argument(
+        "--pipeline-dir",
+        metavar="PATH",
+        type=Path,
+        help="""Load the parser saved in this directory by build-pipeline instead of
+            building it. The parser is built if the saved one is missing or stale.""",
+    )
+
+    arg_parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="""Use a faster parser that drops the spaCy components the rules never
+            read (the dependency parser and lemmatizer). The output is the same.
+            Use a --pipeline-dir saved with build-pipeline --lean.""",
+    )
+
+    arg_parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        type=Path,
+        help="""Cache label results in this directory. Labels whose text and parser
+            have not changed since the last run are not parsed again.""",
+    )
+
+    arg_parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        type=Path,
+        help="""Time every parser component and write a JSON report to this file.
+            A table sorted by time is written next to it with a .txt suffix.
+            Profiling uses a single process.""",
+    )
+
+    arg_parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        type=Path,
+        help="""Write a JSON summary of the run to this file: wall & CPU time for each
+            stage (read, compress, score, nlp, traits, filter, image, dwc, write),
+            labels per second, per-label parse latency and queue wait percentiles, and
+            peak memory.""",
+    )
+
+    arg_parser.add_argument(
+        "--metrics-every",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="""Also append a snapshot of the --metrics summary to a .snapshots.jsonl
+            file next to it this often during the run. (default: no snapshots)""",
+    )
+
+    arg_parser.add_argument(
+        "--slow-report",
+        type=int,
+        metavar="N",
+        help="""Log the N slowest labels with their token counts and their slowest
+            parser components. Labels are parsed one at a time for this.""",
+    )
+
+    arg_parser.add_argument(
+        "--slow-report-file",
+        type=Path,
+        metavar="PATH",
+        help="""Write the --slow-report labels with the time of every parser
+            component to this JSON file, and the logged table next to it as a .txt
+            file. The --metrics summary holds the same report.""",
+    )
+
+    arg_parser.add_argument(
+        "--label-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="""Stop parsing a label after this many seconds, skip it, and log it.
+            Labels are parsed one at a time for this.""",
+    )
+
     arg_parser.add_argument(
         "--spotlight",
         metavar="TRAIT",
@@ -167,8 +379,41 @@ def parse_args() -> argparse.Namespace:
     )
 
     args = arg_parser.parse_args()
+
+    if args.slow_report_file and not args.slow_report:
+        arg_parser.error("--slow-report-file needs --slow-report N")
+
+    if args.job_dir and not args.json_output:
+        arg_parser.error("--job-dir needs a --json-output to merge the shards into")
+
+    # These outputs are rewritten by every run so they cannot resume
+    whole_run = {
+        "--parquet-output": args.parquet_output,
+        "--html-file": args.html_file,
+        "--traiter-dir archive": args.traiter_dir
+        and TraiterArchiveWriter.is_archive(args.traiter_dir),
+    }
+    if (used := [k for k, v in whole_run.items() if v]) and resuming(args):
+        arg_parser.error(
+            f"{', '.join(used)} would only hold the labels parsed when resuming. "
+            "Start the run over or leave them out."
+        )
+
     return args
 
 
+def resuming(args) -> bool:
+    """Check if this run picks up where an earlier one stopped."""
+    if args.job_dir:
+        return (args.job_dir / MANIFEST).exists()
+    json_output = args.json_output
+    return bool(
+        json_output
+        and json_output.suffix == ".jsonl"
+        and json_output.exists()
+        and json_output.stat().st_size
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,23 @@
+"""Data built from the rules and terms that is saved between runs."""
+
+import hashlib
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+ARTIFACT_DIR = Path.home() / ".cache" / "LabelTraiter"
+
+
+def fingerprint(paths: Iterable[Path]) -> str:
+    """Identify a set of source files using their sizes and modification times."""
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path} {stat.st_size} {stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def temp_path(path: Path) -> Path:
+    """Write to this and then rename it so others never see a partial file."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
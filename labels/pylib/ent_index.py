@@ -0,0 +1,58 @@
+"""
+An index of a doc's entities that is shared by the custom pipes.
+
+Every read of doc.ents builds a new tuple of spans, so pipes that read it in a loop
+do quadratic work. The index reads the entities once and keeps them with their labels
+and positions by label. It is cached on the doc and reused until the entity tags on the
+tokens change, which is checked with a single array copy. A pipe can swap an entity's
+trait without changing its tags, so trait types are read from the spans on each call.
+"""
+
+from collections import defaultdict
+
+from spacy.attrs import ENT_IOB, ENT_TYPE
+from spacy.tokens import Doc, Span
+
+if not Doc.has_extension("ent_index"):
+    Doc.set_extension("ent_index", default=None)
+
+
+class EntIndex:
+    def __init__(self, doc: Doc, ents: list[Span]):
+        self.ents: list[Span] = ents
+        self.labels: list[str] = [e.label_ for e in ents]
+        self.positions: dict[str, list[int]] = defaultdict(list)
+        for i, label in enumerate(self.labels):
+            self.positions[label].append(i)
+        self.signature = signature(doc)
+
+    def __len__(self):
+        return len(self.ents)
+
+    @classmethod
+    def of(cls, doc: Doc) -> "EntIndex":
+        """Get the cached index for the doc, or build it if the entities changed."""
+        index = doc._.ent_index
+        if index is None or index.signature != signature(doc):
+            index = cls(doc, list(doc.ents))
+            doc._.ent_index = index
+        return index
+
+    @classmethod
+    def set_ents(cls, doc: Doc, ents: list[Span]) -> "EntIndex":
+        """Update the doc's entities and its index without reading doc.ents back."""
+        doc.ents = ents
+        index = cls(doc, ents)
+        doc._.ent_index = index
+        return index
+
+    def labels_near(self, i: int, radius: int) -> set[str]:
+        beg = max(0, i - radius)
+        return {lb for lb in self.labels[beg : i + radius + 1] if lb}
+
+    def has_trait(self, trait: str) -> bool:
+        return any(e._.trait and e._.trait._trait == trait for e in self.ents)
+
+
+def signature(doc: Doc) -> bytes:
+    return doc.to_array([ENT_IOB, ENT_TYPE]).tobytes()
@@ -0,0 +1,76 @@
+"""Find label images by stem without listing the whole image directory."""
+
+import hashlib
+import json
+from pathlib import Path
+
+from labels.pylib import artifacts
+
+# Image suffixes in the order they are looked for. Either case is matched.
+SUFFIXES = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".gif", ".bmp", ".webp")
+CANDIDATES = tuple(c for s in SUFFIXES for c in (s, s.upper()))
+
+# List the image directory instead of looking up images one at a time for this many
+# labels or more
+LIST_ABOVE = 1000
+
+
+class ImageIndex:
+    """
+    Map label stems to image paths.
+
+    For a few labels this stats the {stem}{suffix} candidates of each label. For many
+    labels it lists the directory once. A listing is saved in the cache directory,
+    when there is one, and reused until the image directory changes.
+    """
+
+    def __init__(
+        self, image_dir: Path, cache_dir: Path | None = None, label_count: int = 0
+    ):
+        self.image_dir = image_dir
+        self.index_path = self.get_index_path(cache_dir) if cache_dir else None
+        self.index = self.read_index()
+        if self.index is None and label_count >= LIST_ABOVE:
+            self.index = self.build_index()
+
+    def get(self, stem: str) -> Path | None:
+        if self.index is not None:
+            name = self.index.get(stem)
+            return self.image_dir / name if name else None
+
+        for suffix in CANDIDATES:
+            path = self.image_dir / f"{stem}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    def get_index_path(self, cache_dir: Path) -> Path:
+        digest = hashlib.sha256(str(self.image_dir.resolve()).encode())
+        return cache_dir / "image_index" / f"{digest.hexdigest()}.json"
+
+    def read_index(self) -> dict[str, str] | None:
+        if not self.index_path or not self.index_path.exists():
+            return None
+        saved = json.loads(self.index_path.read_text())
+        if saved["mtime_ns"] != self.image_dir.stat().st_mtime_ns:
+            return None
+        if saved.get("suffixes") != list(CANDIDATES):
+            return None
+        return saved["images"]
+
+    def build_index(self) -> dict[str, str]:
+        # Get the time first so that images added during the listing make it stale
+        mtime = self.image_dir.stat().st_mtime_ns
+        # Sort so that a stem with several images gets the same one as a lookup would
+        images = [p for p in self.image_dir.iterdir() if p.suffix in CANDIDATES]
+        images.sort(key=lambda p: CANDIDATES.index(p.suffix), reverse=True)
+        index = {p.stem: p.name for p in images}
+
+        if self.index_path:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp = artifacts.temp_path(self.index_path)
+            saved = {"mtime_ns": mtime, "suffixes": list(CANDIDATES), "images": index}
+            temp.write_text(json.dumps(saved))
+            temp.replace(self.index_path)
+
+        return index
@@ -0,0 +1,104 @@
+"""Split a run into shards that are checkpointed so that it can resume after a crash."""
+
+import hashlib
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from labels.pylib.artifacts import temp_path
+from labels.pylib.writers.json_writer import JsonLinesWriter, JsonWriter
+
+MANIFEST = "manifest.json"
+CHECKPOINT = "checkpoint.json"
+
+
+@dataclass
+class Shard:
+    index: int
+    paths: list[Path]
+    output: Path
+
+
+class JobManifest:
+    """
+    A job directory holding the manifest, the checkpoint, and one JSONL file per shard.
+
+    The manifest fixes how the sorted text files are split into shards. The checkpoint
+    holds the indexes of the shards that are done. A shard that was cut off part way
+    resumes at the labels that are not in its output yet.
+    """
+
+    def __init__(self, job_dir: Path, paths: list[Path], shard_size: int):
+        job_dir.mkdir(parents=True, exist_ok=True)
+        self.job_dir = job_dir
+        self.paths = paths
+        self.shard_size = shard_size
+        self.manifest = self.read_manifest()
+        self.checkpoint = self.read_json(CHECKPOINT) or {"completed": []}
+
+    def read_json(self, name: str) -> dict | None:
+        path = self.job_dir / name
+        return json.loads(path.read_text()) if path.exists() else None
+
+    def write_json(self, name: str, data: dict):
+        """Replace the file in one step so that a crash never leaves half of it."""
+        path = self.job_dir / name
+        tmp = temp_path(path)
+        tmp.write_text(json.dumps(data, indent=2))
+        tmp.replace(path)
+
+    def read_manifest(self) -> dict:
+        digest = hashlib.sha256("\n".join(p.name for p in self.paths).encode())
+        manifest = {
+            "text_files": len(self.paths),
+            "text_digest": digest.hexdigest(),
+            "shard_size": self.shard_size,
+            "shards": (len(self.paths) + self.shard_size - 1) // self.shard_size,
+        }
+
+        saved = self.read_json(MANIFEST)
+        if saved and saved != manifest:
+            msg = (
+                f"The job in '{self.job_dir}' was started with other text files or "
+                "another shard size. Use a new job directory."
+            )
+            raise ValueError(msg)
+
+        if not saved:
+            self.write_json(MANIFEST, manifest)
+
+        return manifest
+
+    def shards(self) -> Iterator[Shard]:
+        for index in range(self.manifest["shards"]):
+            start = index * self.shard_size
+            yield Shard(
+                index=index,
+                paths=self.paths[start : start + self.shard_size],
+                output=self.job_dir / f"shard-{index:05d}.jsonl",
+            )
+
+    def pending(self) -> Iterator[Shard]:
+        """Get the shards that are not done, in order."""
+        done = set(self.checkpoint["completed"])
+        return (s for s in self.shards() if s.index not in done)
+
+    def complete(self, shard: Shard):
+        self.checkpoint["completed"].append(shard.index)
+        self.write_json(CHECKPOINT, self.checkpoint)
+
+    def merge(self, json_output: Path):
+        """Gather the shard outputs, in shard order, into the final output."""
+        if json_output.suffix == ".jsonl":
+            json_output.unlink(missing_ok=True)
+            writer = JsonLinesWriter(json_output)
+        else:
+            writer = JsonWriter(json_output)
+
+        for shard in self.shards():
+            with shard.output.open() as f:
+                for line in f:
+                    writer.write_record(json.loads(line))
+
+        writer.close()
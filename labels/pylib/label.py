@@ -1,16 +1,16 @@
-import base64
-import io
-import warnings
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import regex as re
 from flora.pylib.rules.linkable import Linkable
-from PIL import Image, UnidentifiedImageError
 from traiter.pylib import util as t_util
+from traiter.pylib.darwin_core import DarwinCore
 from traiter.pylib.rules.base import Base
 
-MAX_SIZE = 600.0  # pixels
+from labels.pylib import score
+
+if TYPE_CHECKING:
+    from labels.pylib.text_sources import TextSource
 
 
 @dataclass
@@ -25,60 +25,48 @@ class Label:
     score: float = 0.0
     formatted_text: str = ""
     formatted_traits: list[str] = field(default_factory=list)
-
-    def parse(self, nlp, image_paths, vocabulary, encoding="utf8"):
-        with self.path.open(encoding=encoding) as f:
-            self.text = f.read()
-            self.text = t_util.compress(self.text)
-
+    dwc: dict | None = None
+    parsed: bool = False
+    cached: bool = False
+    token_count: int = 0
+    parse_seconds: float = 0.0
+    component_seconds: dict[str, float] = field(default_factory=dict)
+    timed_out: bool = False
+
+    def parse_text(self, nlp, vocabulary):
+        """Parse & score text that is already in the label."""
         doc = nlp(self.text)
-        self.traits = [e._.trait for e in doc.ents]
-
-        self.image_path = image_paths.get(self.path.stem)
-        self.encoded_image = self.encode_image()
-
+        self.add_doc(doc)
         self.score_label(vocabulary)
 
-    def score_label(self, vocabulary):
-        """
-        Score the label content.
+    @classmethod
+    def from_text(cls, text: str, stem: str = "label") -> "Label":
+        """Make a label from text that did not come from a file."""
+        return cls(path=Path(f"{stem}.txt"), text=t_util.compress(text))
 
-        score = number of words in the label (words = all chars are letters)
-                divided by the number of those words in the vocabulary
-        """
-        all_words = [t for t in re.split(r"[^\p{L}]+", self.text.lower()) if t]
-        self.word_count = len(all_words)
-
-        self.valid_words = sum(1 for w in all_words if w in vocabulary)
-
-        self.score = 0.0
-        if self.word_count > 0:
-            self.score = round(self.valid_words / self.word_count, 2)
-
-    def encode_image(self) -> str:
-        if not self.image_path:
-            return ""
-
-        with warnings.catch_warnings():  # Turn off EXIF warnings
-            warnings.filterwarnings("ignore", category=UserWarning)
-            try:
-                image = Image.open(self.image_path)
-            except (FileNotFoundError, TypeError, ValueError, UnidentifiedImageError):
-                return ""
+    def read_raw(self, encoding="utf8", source: "TextSource | None" = None) -> str:
+        """Read the text from the label's file or from a source like a zip archive."""
+        if source:
+            return source.read(self.path, encoding)
+        with self.path.open(encoding=encoding) as f:
+            return f.read()
 
-        if image.size[1] > image.size[0]:
-            width = round(MAX_SIZE / image.size[1] * image.size[0])
-            image = image.resize((width, int(MAX_SIZE)))
-        else:
-            height = round(MAX_SIZE / image.size[0] * image.size[1])
-            image = image.resize((int(MAX_SIZE), height))
+    def add_doc(self, doc):
+        """Attach the results of an nlp pass over this label's text."""
+        self.traits = [e._.trait for e in doc.ents]
+        self.token_count = len(doc)
+        self.parsed = True
 
-        memory = io.BytesIO()
-        image.save(memory, format="JPEG")
-        image_bytes = memory.getvalue()
+    def as_dwc(self) -> dict:
+        if self.dwc is None:
+            dwc = DarwinCore()
+            _ = [t.to_dwc(dwc) for t in self.traits]
+            self.dwc = dwc.to_dict()
+        return self.dwc
 
-        string = base64.b64encode(image_bytes).decode()
-        return string
+    def score_label(self, vocabulary):
+        """Score the label content, see score.py for scoring many labels at once."""
+        score.score_labels([self], vocabulary)
 
     def too_short(self, length_cutoff):
         return self.word_count < length_cutoff
@@ -1,73 +1,210 @@
 import logging
+import multiprocessing
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
+from time import perf_counter
 
-from flora.pylib.rules import terms as f_terms
-from spell_well.pylib.spell_well import SpellWell
+from spacy.tokens import Doc
 from tqdm import tqdm
-from traiter.pylib import term_util
 
-from labels.pylib import pipeline
+from labels.pylib import pipeline, score
+from labels.pylib.image_index import ImageIndex
 from labels.pylib.label import Label
+from labels.pylib.metrics import Metrics, StageStats
+from labels.pylib.profiler import Profiler
+from labels.pylib.reader import read_ahead
+from labels.pylib.result_cache import ResultCache
+from labels.pylib.slow_labels import LabelTimeout, SlowLabels, time_limit
+from labels.pylib.text_sources import TextSource, text_source
+from labels.pylib.thumbnails import Thumbnails
+from labels.pylib.triage import Triage
+from labels.pylib.vocabulary import Vocabulary
 
 
 class Labels:
     def __init__(self, args):
-        self.labels: list[Label] = self.get_labels(args)
-        self.nlp = pipeline.build()
-        self.image_paths = self.get_image_paths(args)
-        self.vocabulary: set = self.get_vocabulary()
+        self.source = text_source(args.text_dir)
+        self.paths: list[Path] = self.get_paths(args, self.source)
+        self.image_paths = self.get_image_paths(args, len(self.paths))
         self.encoding = args.encoding
+        self.read_ahead = args.read_ahead
+        self.batch_size = args.batch_size
+        self.workers = args.workers
+        self.pipeline_dir = args.pipeline_dir
+        self.lean = args.lean
+        self.metrics = Metrics(args.metrics, args.metrics_every)
+        self.cache = self.get_cache(args, self.metrics)
+        self.profiler = Profiler() if args.profile else None
+        self.slow = SlowLabels(args.slow_report) if args.slow_report else None
+        self.timeout = args.label_timeout
+        self.thumbnails = (
+            Thumbnails(self.image_paths, args.cache_dir, metrics=self.metrics)
+            if args.html_file
+            else None
+        )
+        self.triage = args.triage
+        self.cutoffs = (
+            (args.length_cutoff, args.score_cutoff) if args.filter_first else None
+        )
         self.score_too_low = 0
+        self.timed_out = 0
         self.too_short = 0
-        self.unfiltered_count = len(self.labels)
+        self.kept = 0
+        self.unfiltered_count = len(self.paths)
+
+    @cached_property
+    def nlp(self):
+        nlp = pipeline.load(self.pipeline_dir, lean=self.lean)
+        return self.profiler.wrap(nlp) if self.profiler else nlp
+
+    @cached_property
+    def vocabulary(self) -> Vocabulary:
+        return Vocabulary()
+
+    @cached_property
+    def pool(self):
+        """Start the workers once, a job parses many shards with them."""
+        # Build the vocabulary index here so that workers do not race to build it
+        self.vocabulary.load()
+        return multiprocessing.Pool(
+            self.workers,
+            initializer=init_worker,
+            initargs=(self.pipeline_dir, self.lean, self.options),
+        )
+
+    def close(self):
+        if "pool" in self.__dict__:
+            self.pool.close()
+            self.pool.join()
+            del self.pool
 
     @staticmethod
-    def get_labels(args):
-        labels = [Label(p) for p in sorted(args.text_dir.glob("*.txt"))]
+    def get_paths(args, source: TextSource | None) -> list[Path]:
+        paths = source.names() if source else sorted(args.text_dir.glob("*.txt"))
 
         if args.limit:
-            labels = labels[args.offset : args.limit + args.offset]
+            paths = paths[args.offset : args.limit + args.offset]
 
-        return labels
+        return paths
 
     @staticmethod
-    def get_image_paths(args):
-        images = {}
-        if args.image_dir:
-            images = {p.stem: p for p in args.image_dir.glob("*")}
-        return images
+    def get_cache(args, metrics: Metrics) -> ResultCache | None:
+        if not args.cache_dir:
+            return None
+        # HTML output needs traits and those are not cached
+        return ResultCache(
+            args.cache_dir, read=not args.html_file, lean=args.lean, metrics=metrics
+        )
 
     @staticmethod
-    def get_vocabulary():
-        """Get words for scoring label content."""
-        spell_well = SpellWell()
-        vocabulary = {w.lower() for w in spell_well.vocab_to_set()}
+    def get_image_paths(args, label_count: int) -> ImageIndex | dict:
+        # Images are only used in HTML output
+        if not args.image_dir or not args.html_file:
+            return {}
+        return ImageIndex(args.image_dir, args.cache_dir, label_count)
+
+    def parsed(self) -> Iterator[Label]:
+        """Parse labels lazily, only creating them as they are needed."""
+        labels = (self.metrics.start(Label(p)) for p in self.paths)
+        labels = read_ahead(
+            labels, self.read_ahead, self.encoding, self.source, metrics=self.metrics
+        )
+        labels = (self.metrics.enter(lb) for lb in labels)
+
+        if self.cache:
+            parsed = self.cache.parse(labels, self.parse_uncached)
+        else:
+            parsed = self.parse_uncached(labels)
+
+        for lb in parsed:
+            if self.slow:
+                self.slow.add(lb)
+            yield self.metrics.finish(lb)
+
+    def parse_uncached(self, labels: Iterable[Label]) -> Iterator[Label]:
+        if self.workers > 1 and self.profiler:
+            logging.warning("Profiling is done in a single process, ignoring --workers")
+
+        elif self.workers > 1:
+            yield from self.parse_in_parallel(labels)
+            return
+
+        yield from parse_labels(
+            labels, self.nlp, self.vocabulary, metrics=self.metrics, **self.options
+        )
 
-        path = Path(f_terms.__file__).parent / "binomial_terms.zip"
-        for term in term_util.read_terms(path):
-            vocabulary |= set(term["pattern"].lower().split())
+    def skip(self, stems: set[str]):
+        """Drop labels that were already written by an earlier run."""
+        if not stems:
+            return
+        paths = [p for p in self.paths if p.stem not in stems]
+        logging.info(f"Skipping {len(self.paths) - len(paths)} labels already written")
+        self.paths = paths
+        self.unfiltered_count = len(self.paths)
 
-        path = Path(f_terms.__file__).parent / "monomial_terms.zip"
-        vocabulary |= {t["pattern"] for t in term_util.read_terms(path)}
+    @property
+    def options(self) -> dict:
+        return {
+            "batch_size": self.batch_size,
+            "cutoffs": self.cutoffs,
+            "triage": self.triage,
+            "per_label": bool(self.slow),
+            "timeout": self.timeout,
+        }
 
-        return vocabulary
+    def parse_in_parallel(self, labels: Iterable[Label]) -> Iterator[Label]:
+        """
+        Parse shards of labels in worker processes.
 
-    def parse(self):
-        for lb in tqdm(self.labels, desc="parse"):
-            lb.parse(
-                self.nlp, self.image_paths, self.vocabulary, encoding=self.encoding
-            )
+        Every worker builds its own pipeline once. Shards are contiguous slices of the
+        sorted labels and the results come back in shard order, so the output order is
+        the same as a serial run.
+        """
+        # Only send labels that are not from the result cache to the workers
+        shards = deque()
+
+        def to_parse():
+            for shard in batched(labels, self.batch_size):
+                shards.append(shard)
+                yield [lb for lb in shard if not lb.cached]
+
+        for parsed, stages in self.pool.imap(parse_shard, to_parse()):
+            self.metrics.merge(stages)
+            parsed = iter(parsed)
+            for lb in shards.popleft():
+                yield lb if lb.cached else next(parsed)
+
+    def stream(self, length_cutoff, score_cutoff) -> Iterator[Label]:
+        """
+        Parse and filter labels one at a time.
+
+        Nothing is kept here so memory stays flat no matter how many labels there are.
+        Images are only encoded for labels that are kept.
+        """
+        parsed = tqdm(self.parsed(), total=len(self.paths), desc="parse")
+        kept = (lb for lb in parsed if self.keep(lb, length_cutoff, score_cutoff))
+        yield from self.thumbnails.add(kept) if self.thumbnails else kept
+
+    def keep(self, lb: Label, length_cutoff, score_cutoff) -> bool:
+        with self.metrics.stage("filter"):
+            if lb.timed_out:
+                logging.warning(
+                    f"Skipped '{lb.path.stem}', "
+                    f"parsing took over {self.timeout} seconds"
+                )
+                self.timed_out += 1
+                return False
 
-    def filter(self, length_cutoff, score_cutoff):
-        filtered = []
-        for lb in tqdm(self.labels, desc="filter"):
             if lb.too_short(length_cutoff):
                 logging.warning(
                     f"Removed '{lb.path.stem}', "
                     f"length {lb.word_count} < {length_cutoff} cutoff"
                 )
                 self.too_short += 1
-                continue
+                return False
 
             if lb.bad_score(score_cutoff):
                 logging.warning(
@@ -75,8 +212,126 @@ class Labels:
                     f"score {lb.score} < {score_cutoff} cutoff"
                 )
                 self.score_too_low += 1
+                return False
+
+            self.kept += 1
+            return True
+
+
+def parse_labels(
+    labels: Iterable[Label],
+    nlp,
+    vocabulary: Vocabulary,
+    *,
+    batch_size: int = 128,
+    cutoffs: tuple[int, float] | None = None,
+    triage: bool = False,
+    per_label: bool = False,
+    timeout: float | None = None,
+    metrics: Metrics | None = None,
+) -> Iterator[Label]:
+    """
+    Score batches of labels and stream their texts through the nlp pipeline.
+
+    The label texts must already be read, see reader.read_ahead(). Labels that came
+    from the result cache are returned as they are.
+
+    When there are (length, score) cutoffs, labels that fail them are returned without
+    being parsed. They still have their scores so that they are filtered out later.
+
+    With triage, each batch is split by the trait groups its labels can skip and
+    every part is parsed with those pipes disabled.
+
+    With per_label, labels are parsed one at a time so that each label gets its own
+    parse time and the time of each pipe. That is also what allows a timeout.
+    """
+    router = Triage(nlp) if triage else None
+    metrics = metrics or Metrics()
+
+    for batch in batched(labels, batch_size):
+        # Labels from the result cache already have their results
+        todo = [lb for lb in batch if not lb.cached]
+
+        with metrics.stage("parse/score"):
+            if cutoffs:
+                to_parse, _ = score.prefilter(todo, vocabulary, *cutoffs)
+            else:
+                score.score_labels(todo, vocabulary)
+                to_parse = todo
+
+        routes = defaultdict(list)
+        for lb in to_parse:
+            routes[router.route(lb.text) if router else frozenset()].append(lb)
+
+        for route, routed in routes.items():
+            disable = router.disable(route) if router else []
+
+            if per_label or timeout:
+                for lb in routed:
+                    with metrics.stage("parse/nlp"):
+                        doc = parse_one(lb, nlp, disable, timeout)
+                    if doc is not None:
+                        with metrics.stage("parse/traits"):
+                            lb.add_doc(doc)
                 continue
 
-            filtered.append(lb)
+            texts = [lb.text for lb in routed]
+            docs = iter(nlp.pipe(texts, batch_size=batch_size, disable=disable))
+            for lb in routed:
+                with metrics.stage("parse/nlp"):
+                    doc = next(docs)
+                with metrics.stage("parse/traits"):
+                    lb.add_doc(doc)
+
+        yield from batch
+
+
+def parse_one(lb: Label, nlp, disable: list[str], timeout: float | None) -> Doc | None:
+    """Run one label through the pipes, timing each one. None if it timed out."""
+    doc = None
+    name, start = "tokenizer", perf_counter()
+    pipe_start = start
+    try:
+        with time_limit(timeout):
+            doc = nlp.make_doc(lb.text)
+            lb.component_seconds[name] = perf_counter() - pipe_start
+            for pipe_name, proc in nlp.pipeline:
+                if pipe_name not in disable:
+                    name, pipe_start = pipe_name, perf_counter()
+                    doc = proc(doc)
+                    lb.component_seconds[name] = perf_counter() - pipe_start
+    except LabelTimeout:
+        lb.component_seconds[name] = perf_counter() - pipe_start  # The one it was in
+        lb.timed_out = True
+        doc = None
+    lb.parse_seconds = perf_counter() - start
+    return doc
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+# Per-process state for parallel parsing
+WORKER = {}
+
+
+def init_worker(pipeline_dir, lean, options):
+    WORKER["nlp"] = pipeline.load(pipeline_dir, lean=lean)
+    WORKER["vocabulary"] = Vocabulary(checked=True)  # Labels.pool checked it
+    WORKER["options"] = options
+
 
-        self.labels = filtered
+def parse_shard(labels: list[Label]) -> tuple[list[Label], dict[str, StageStats]]:
+    metrics = Metrics()
+    labels = list(
+        parse_labels(
+            labels,
+            WORKER["nlp"],
+            WORKER["vocabulary"],
+            metrics=metrics,
+            **WORKER["options"],
+        )
+    )
+    return labels, dict(metrics.stages)
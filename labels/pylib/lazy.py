@@ -0,0 +1,63 @@
+"""Class variables that are only built when they are first used."""
+
+import pickle
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from labels.pylib import artifacts
+
+
+class LazyClassVar:
+    """
+    Build a class variable the first time it is read and then keep it.
+
+    build is called with the owning class. When sources is given, it is also called
+    with the owning class and returns the files the value is built from. The value is
+    then saved in the artifact directory and reused until those files change.
+
+    Do not annotate these on a dataclass. Building a dataclass reads every annotated
+    class attribute, ClassVars included, which would build the value right away.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[type], Any],
+        *,
+        sources: Callable[[type], list[Path]] | None = None,
+    ):
+        self.build = build
+        self.sources = sources
+        self.name = ""
+        self.value = None
+        self.loaded = False
+
+    def __set_name__(self, owner, name):
+        self.name = f"{owner.__module__}.{owner.__qualname__}.{name}"
+
+    def __get__(self, obj, owner=None):
+        if not self.loaded:
+            owner = owner if owner else type(obj)
+            self.value = self.load(owner) if self.sources else self.build(owner)
+            self.loaded = True
+        return self.value
+
+    def load(self, owner):
+        path = artifacts.ARTIFACT_DIR / f"{self.name}.pickle"
+        fingerprint = artifacts.fingerprint(self.sources(owner))
+
+        if path.exists():
+            with path.open("rb") as f:
+                saved_fingerprint, value = pickle.load(f)  # noqa: S301
+            if saved_fingerprint == fingerprint:
+                return value
+
+        value = self.build(owner)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = artifacts.temp_path(path)
+        with temp.open("wb") as f:
+            pickle.dump((fingerprint, value), f)
+        temp.replace(path)
+
+        return value
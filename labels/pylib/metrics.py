@@ -0,0 +1,158 @@
+"""Time the stages of a run and summarize its throughput, latency, and memory."""
+
+import json
+import resource
+import threading
+from array import array
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter, process_time, thread_time
+
+import numpy as np
+
+from labels.pylib.label import Label
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class StageStats:
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+class Metrics:
+    """
+    Collect the wall and CPU time of named stages.
+
+    Stage names are paths like "parse/nlp" and the summary nests them. A parent stage
+    that is not timed itself gets the sums of its children. Stages run on many threads
+    (reads, images) or in many worker processes (parsing) add up the time spent in
+    all of them, so they can add up to more than the run's wall time.
+
+    Per-label latency runs from when a label enters the parser until it is parsed. The
+    time a label waits before that, from its creation through the read ahead queue, is
+    its queue wait.
+    """
+
+    def __init__(self, path: Path | None = None, every: float = 0.0):
+        self.path = path
+        self.every = every
+        self.stages: dict[str, StageStats] = defaultdict(StageStats)
+        self.lock = threading.Lock()  # Stages are timed on pool threads too
+        self.started = perf_counter()
+        self.snapshot_at = self.started + every
+        self.created: dict[Path, float] = {}
+        self.entered: dict[Path, float] = {}
+        self.waits = array("d")
+        self.latencies = array("d")
+        self.extra = {}  # Other reports to put into the summary
+
+    @contextmanager
+    def stage(self, name: str):
+        wall, cpu = perf_counter(), thread_time()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - wall, thread_time() - cpu)
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1):
+        with self.lock:
+            stats = self.stages[name]
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.calls += calls
+
+    def merge(self, stages: dict[str, StageStats]):
+        """Add stage times from a worker process."""
+        for name, stats in stages.items():
+            self.add(name, stats.wall, stats.cpu, stats.calls)
+
+    def start(self, lb: Label) -> Label:
+        """Note when a label is created."""
+        self.created[lb.path] = perf_counter()
+        return lb
+
+    def enter(self, lb: Label) -> Label:
+        """Note when a label enters the parser."""
+        now = perf_counter()
+        if (created := self.created.pop(lb.path, None)) is not None:
+            self.waits.append(now - created)
+        self.entered[lb.path] = now
+        return lb
+
+    def finish(self, lb: Label) -> Label:
+        """Note when a label is parsed, kept or not, and snapshot when one is due."""
+        if (entered := self.entered.pop(lb.path, None)) is not None:
+            self.latencies.append(perf_counter() - entered)
+        self.tick()
+        return lb
+
+    def summary(self) -> dict:
+        wall = perf_counter() - self.started
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        count = len(self.latencies)
+        return {
+            "wall_seconds": wall,
+            "cpu_seconds": process_time() + children.ru_utime + children.ru_stime,
+            "labels": count,
+            "labels_per_second": count / wall if wall else 0.0,
+            "latency_ms": percentiles(self.latencies),
+            "queue_wait_ms": percentiles(self.waits),
+            # ru_maxrss is in KiB on Linux
+            "peak_rss_mb": {
+                "main": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "workers": children.ru_maxrss / 1024,
+            },
+            "stages": self.tree(),
+        } | self.extra
+
+    def tree(self) -> dict:
+        root = {}
+        with self.lock:
+            stages = {n: asdict(s) for n, s in self.stages.items()}
+        for name, stats in sorted(stages.items()):
+            node = {"stages": root}
+            for part in name.split("/"):
+                node = node["stages"].setdefault(part, {"stages": {}})
+            node |= stats
+        for node in root.values():
+            add_children(node)
+        return root
+
+    def tick(self):
+        """Append a snapshot of the summary to the snapshot file when one is due."""
+        if not self.path or not self.every or perf_counter() < self.snapshot_at:
+            return
+        self.snapshot_at = perf_counter() + self.every
+        with self.path.with_suffix(".snapshots.jsonl").open("a") as f:
+            f.write(json.dumps(self.summary()) + "\n")
+
+    def write(self):
+        with self.path.open("w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def percentiles(seconds: array) -> dict[str, float]:
+    """Get the percentiles and the maximum of the times in milliseconds."""
+    if not seconds:
+        return {}
+    values = np.percentile(seconds, PERCENTILES)
+    times = {f"p{p}": 1000.0 * v for p, v in zip(PERCENTILES, values, strict=True)}
+    times["max"] = 1000.0 * max(seconds)
+    return times
+
+
+def add_children(node: dict):
+    """Give stages that were not timed themselves the sums of their children."""
+    for child in node["stages"].values():
+        add_children(child)
+    if "calls" not in node:
+        for key in ("wall", "cpu"):
+            node[key] = sum(c[key] for c in node["stages"].values())
+    stages = node.pop("stages")
+    if stages:
+        node["stages"] = stages  # After the node's own numbers
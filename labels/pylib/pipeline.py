@@ -1,3 +1,10 @@
+import hashlib
+import importlib.util
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
 import spacy
 from flora.pylib.rules import delete_missing, delete_too_far
 from flora.pylib.rules import post_process as flora_post_process
@@ -49,16 +56,37 @@ from labels.pylib.rules.locality import Locality
 
 # from traiter.pylib.pipes import debug
 
+MODEL = "en_core_web_md"
+
+# Packages holding the rules & terms used to build the pipeline
+RULE_PACKAGES = ["labels", "flora", "traiter"]
+
+FINGERPRINT = "fingerprint.txt"
+
+# Where the pipe names in each trait group are kept in nlp.meta
+TRAIT_GROUPS = "trait_groups"
+
+# Model components that the rules never read. The rules match on token text,
+# shapes, and POS tags (taxon, locality, & job patterns), so the tagger, the
+# attribute ruler that maps its tags to POS, and the tok2vec layer that feeds it
+# stay. The vectors stay too because the tok2vec layer uses them as features.
+# The traiter sentence pipe sets every sentence boundary, so the parser only
+# adds dependency arcs, and no rule reads lemmas or dependencies.
+LEAN_EXCLUDE = ["parser", "lemmatizer", "senter"]
 
-def build():  # noqa: PLR0915
+
+def build(*, fused_locality: bool = True, lean: bool = False):  # noqa: PLR0915
     extensions.add_extensions()
 
-    nlp = spacy.load("en_core_web_md", exclude=["ner"])
+    exclude = ["ner", *LEAN_EXCLUDE] if lean else ["ner"]
+    nlp = spacy.load(MODEL, exclude=exclude)
 
     tokenizer.setup_tokenizer(nlp)
 
-    config = {"base_model": "en_core_web_md"}
-    nlp.add_pipe(sentence.SENTENCES, config=config, before="parser")
+    # Sentences go right after the tagger in both pipelines
+    config = {"base_model": MODEL}
+    before = "attribute_ruler" if lean else "parser"
+    nlp.add_pipe(sentence.SENTENCES, config=config, before=before)
 
     Date.pipe(nlp)
 
@@ -67,27 +95,31 @@ def build():  # noqa: PLR0915
 
     Elevation.pipe(nlp)
     LatLong.pipe(nlp)
-    TRS.pipe(nlp)
-    UTM.pipe(nlp)
+    with trait_group(nlp, "geo"):
+        TRS.pipe(nlp)
+        UTM.pipe(nlp)
 
-    Color.pipe(nlp)
+    with trait_group(nlp, "floral"):
+        Color.pipe(nlp)
     Habitat.pipe(nlp)
 
-    Duration.pipe(nlp)
-    FlowerLocation.pipe(nlp)
-    FlowerMorphology.pipe(nlp)
-    LeafDuration.pipe(nlp)
-    LeafFolding.pipe(nlp)
-    Morphology.pipe(nlp)
-    Odor.pipe(nlp)
-    PlantDuration.pipe(nlp)
-    Reproduction.pipe(nlp)
-    Sex.pipe(nlp)
-    Venation.pipe(nlp)
-    Woodiness.pipe(nlp)
-
-    IdNumber.pipe(nlp)
-    remove_unlabeled_ids.pipe(nlp)
+    with trait_group(nlp, "floral"):
+        Duration.pipe(nlp)
+        FlowerLocation.pipe(nlp)
+        FlowerMorphology.pipe(nlp)
+        LeafDuration.pipe(nlp)
+        LeafFolding.pipe(nlp)
+        Morphology.pipe(nlp)
+        Odor.pipe(nlp)
+        PlantDuration.pipe(nlp)
+        Reproduction.pipe(nlp)
+        Sex.pipe(nlp)
+        Venation.pipe(nlp)
+        Woodiness.pipe(nlp)
+
+    with trait_group(nlp, "id_number"):
+        IdNumber.pipe(nlp)
+        remove_unlabeled_ids.pipe(nlp)
 
     Name.pipe(nlp, overwrite=["subpart", "color", "admin_unit"])
     Job.pipe(nlp)
@@ -98,9 +130,10 @@ def build():  # noqa: PLR0915
     Count.pipe(nlp)
 
     Habit.pipe(nlp)
-    Margin.pipe(nlp)
-    Shape.pipe(nlp)
-    Surface.pipe(nlp)
+    with trait_group(nlp, "floral"):
+        Margin.pipe(nlp)
+        Shape.pipe(nlp)
+        Surface.pipe(nlp)
 
     AdminUnit.pipe(nlp, overwrite=["color"])
 
@@ -120,9 +153,71 @@ def build():  # noqa: PLR0915
 
     AssociatedTaxonLabel.pipe(nlp)
 
-    Locality.pipe(nlp)
+    Locality.pipe(nlp, fused=fused_locality)
 
     flora_post_process.pipe(nlp)
     post_process.pipe(nlp)
 
     return nlp
+
+
+@contextmanager
+def trait_group(nlp, group: str):
+    """Record the pipes added in this block as part of a group that triage can skip."""
+    before = set(nlp.pipe_names)
+    yield
+    added = [n for n in nlp.pipe_names if n not in before]
+    nlp.meta.setdefault(TRAIT_GROUPS, {}).setdefault(group, []).extend(added)
+
+
+def fingerprint(*, lean: bool = False) -> str:
+    """
+    Identify the code, terms, and model that go into the pipeline.
+
+    The fingerprint changes when any rule or term file changes. It uses file sizes
+    and modification times so that it is quick to get.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{spacy.__version__} {os.getenv('MOCK_TRAITER')}".encode())
+    digest.update(str(spacy.util.get_package_version(MODEL)).encode())
+    digest.update(f"lean={lean}".encode())
+
+    for package in RULE_PACKAGES:
+        for root in importlib.util.find_spec(package).submodule_search_locations:
+            root = Path(root)
+            for path in sorted(root.rglob("*")):
+                if path.suffix in {".py", ".csv", ".zip"}:
+                    stat = path.stat()
+                    rel = path.relative_to(root)
+                    digest.update(f"{rel} {stat.st_size} {stat.st_mtime_ns}".encode())
+
+    return digest.hexdigest()
+
+
+def save(pipeline_dir: Path, *, lean: bool = False):
+    """Build the pipeline and save it so that later runs can skip building it."""
+    nlp = build(lean=lean)
+    nlp.to_disk(pipeline_dir)
+    (pipeline_dir / FINGERPRINT).write_text(fingerprint(lean=lean))
+
+
+def load(pipeline_dir: Path | None = None, *, lean: bool = False):
+    """Load a saved pipeline, fall back to building one if it is missing or stale."""
+    if not pipeline_dir:
+        return build(lean=lean)
+
+    saved = pipeline_dir / FINGERPRINT
+    if not saved.exists():
+        logging.warning(f"No saved pipeline in '{pipeline_dir}', building it")
+        return build(lean=lean)
+
+    if saved.read_text() != fingerprint(lean=lean):
+        logging.warning(
+            f"The saved pipeline in '{pipeline_dir}' is stale or not the "
+            f"{'lean' if lean else 'full'} pipeline, building it"
+        )
+        return build(lean=lean)
+
+    # Custom extensions are not saved with the pipeline
+    extensions.add_extensions()
+    return spacy.load(pipeline_dir)
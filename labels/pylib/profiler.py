@@ -0,0 +1,133 @@
+"""Time every component in the nlp pipeline."""
+
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+
+from spacy.language import Language
+from spacy.tokens import Doc
+
+
+@dataclass
+class PipeStats:
+    name: str
+    calls: int = 0
+    docs: int = 0
+    seconds: float = 0.0
+    ents_in: int = 0
+    ents_out: int = 0
+
+
+class ProfiledPipe:
+    """
+    Wrap a pipeline component and record its time and entity counts.
+
+    Each component is only charged for its own work. Time spent in other profiled
+    components is subtracted, both the upstream components that run while this one
+    asks for its next doc in pipe() and the components that this one calls itself,
+    like repeat_until_stable running extend_locality again.
+    """
+
+    def __init__(self, proc, stats: PipeStats, stack: list[list[float]]):
+        self.proc = proc
+        self.stats = stats
+        self.stack = stack  # The time of nested calls for each running call
+
+    def __getattr__(self, attr):
+        return getattr(self.proc, attr)
+
+    def __call__(self, doc: Doc) -> Doc:
+        self.stats.calls += 1
+        self.stats.docs += 1
+        self.stats.ents_in += len(doc.ents)
+        doc, seconds = self.run(self.proc, doc)
+        self.stats.seconds += seconds
+        self.stats.ents_out += len(doc.ents)
+        return doc
+
+    def pipe(self, docs: Iterable[Doc], **kwargs) -> Iterator[Doc]:
+        self.stats.calls += 1
+        docs = iter(docs)
+
+        def inputs():
+            # Getting a doc runs the upstream components, that is not this one's time
+            while (doc := self.run(next, docs, DONE)[0]) is not DONE:
+                self.stats.ents_in += len(doc.ents)
+                yield doc
+
+        if hasattr(self.proc, "pipe"):
+            outputs = self.proc.pipe(inputs(), **kwargs)
+        else:
+            outputs = (self.proc(doc) for doc in inputs())
+
+        while True:
+            doc, seconds = self.run(next, outputs, DONE)
+            self.stats.seconds += seconds
+            if doc is DONE:
+                return
+            self.stats.docs += 1
+            self.stats.ents_out += len(doc.ents)
+            yield doc
+
+    def run(self, func, *args):
+        """Call func and get its result and its time without the nested calls."""
+        nested = [0.0]
+        self.stack.append(nested)
+        start = perf_counter()
+        try:
+            result = func(*args)
+        finally:
+            elapsed = perf_counter() - start
+            self.stack.pop()
+            if self.stack:
+                self.stack[-1][0] += elapsed
+        return result, elapsed - nested[0]
+
+
+DONE = object()
+
+
+class Profiler:
+    def __init__(self):
+        self.stats: list[PipeStats] = []
+        self.stack: list[list[float]] = []
+
+    def wrap(self, nlp: Language) -> Language:
+        """Replace every component with a profiled version of itself."""
+        for i, (name, proc) in enumerate(nlp._components):
+            stats = PipeStats(name=name)
+            self.stats.append(stats)
+            nlp._components[i] = (name, ProfiledPipe(proc, stats, self.stack))
+        return nlp
+
+    def report(self) -> list[dict]:
+        total = sum(s.seconds for s in self.stats) or 1.0
+        rows = []
+        for stats in sorted(self.stats, key=lambda s: s.seconds, reverse=True):
+            row = asdict(stats)
+            row["ms_per_doc"] = 1000.0 * stats.seconds / stats.docs if stats.docs else 0
+            row["percent"] = 100.0 * stats.seconds / total
+            rows.append(row)
+        return rows
+
+    def table(self) -> str:
+        header = (
+            f"{'component':<32} {'seconds':>9} {'%':>6} {'ms/doc':>8} "
+            f"{'docs':>8} {'ents in':>9} {'ents out':>9}"
+        )
+        lines = [header]
+        lines += [
+            f"{r['name']:<32} {r['seconds']:9.3f} {r['percent']:6.2f} "
+            f"{r['ms_per_doc']:8.3f} {r['docs']:8d} {r['ents_in']:9d} "
+            f"{r['ents_out']:9d}"
+            for r in self.report()
+        ]
+        return "\n".join(lines)
+
+    def write(self, profile: Path):
+        """Write the JSON report to the path and the table next to it."""
+        with profile.open("w") as f:
+            json.dump(self.report(), f, indent=2)
+        profile.with_suffix(".txt").write_text(self.table() + "\n")
@@ -0,0 +1,59 @@
+"""Read label texts ahead of the parser so that file reads and parsing overlap."""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from traiter.pylib import util as t_util
+
+from labels.pylib.label import Label
+from labels.pylib.metrics import Metrics
+from labels.pylib.text_sources import TextSource
+
+THREADS = 8
+
+
+def read_ahead(
+    labels: Iterable[Label],
+    ahead: int,
+    encoding: str = "utf8",
+    source: TextSource | None = None,
+    *,
+    threads: int = THREADS,
+    metrics: Metrics | None = None,
+) -> Iterator[Label]:
+    """
+    Read and compress label texts on a thread pool, in order.
+
+    At most "ahead" labels are read but not yet taken by the parser, so memory stays
+    bounded when the parser is the slow part. With ahead < 1 each text is read just
+    before its label is passed on.
+    """
+    metrics = metrics or Metrics()
+
+    def read(lb: Label):
+        with metrics.stage("parse/read"):
+            text = lb.read_raw(encoding, source)
+        with metrics.stage("parse/compress"):
+            lb.text = t_util.compress(text)
+
+    if ahead < 1:
+        for lb in labels:
+            read(lb)
+            yield lb
+        return
+
+    with ThreadPoolExecutor(threads) as pool:
+        pending = deque()
+        for lb in labels:
+            pending.append((lb, pool.submit(read, lb)))
+            if len(pending) >= ahead:
+                yield take(pending)
+        while pending:
+            yield take(pending)
+
+
+def take(pending: deque) -> Label:
+    lb, future = pending.popleft()
+    future.result()  # Raises any read errors here
+    return lb
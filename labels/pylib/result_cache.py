@@ -0,0 +1,122 @@
+"""Cache parse results so that unchanged labels are not parsed again."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from labels.pylib import pipeline, vocabulary
+from labels.pylib.label import Label
+from labels.pylib.metrics import Metrics
+
+COMMIT_EVERY = 1000
+
+
+class ResultCache:
+    """
+    An on-disk cache of label results.
+
+    The key is a hash of the label text and the pipeline fingerprint. The value holds
+    the DwC record, word_count, valid_words, and score. Traits are not cached so a
+    cache that is not readable (read=False) will only store results.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        read: bool = True,
+        lean: bool = False,
+        metrics: Metrics | None = None,
+    ):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.read = read
+        self.metrics = metrics or Metrics()
+        # Scores depend on the vocabulary
+        self.fingerprint = pipeline.fingerprint(lean=lean) + vocabulary.fingerprint()
+        self.lock = threading.Lock()  # Lookups may come from a pool's feeder thread
+        self.hits = 0
+        self.puts = 0
+        self.db = sqlite3.connect(
+            cache_dir / "label_results.sqlite", check_same_thread=False
+        )
+        self.db.execute(
+            "create table if not exists results (key text primary key, result text)"
+        )
+
+    def key(self, lb: Label) -> str:
+        digest = hashlib.sha256(self.fingerprint.encode())
+        digest.update(lb.text.encode())
+        return digest.hexdigest()
+
+    def get(self, lb: Label) -> bool:
+        """Fill in a label from the cache, return True if it was found."""
+        if not self.read:
+            return False
+
+        with self.lock:
+            row = self.db.execute(
+                "select result from results where key = ?", (self.key(lb),)
+            ).fetchone()
+
+        if not row:
+            return False
+
+        result = json.loads(row[0])
+        lb.dwc = result["dwc"]
+        lb.word_count = result["word_count"]
+        lb.valid_words = result["valid_words"]
+        lb.score = result["score"]
+        self.hits += 1
+        return True
+
+    def put(self, lb: Label):
+        # Build the DwC record here, the writers' dwc stage only gets it back
+        with self.metrics.stage("dwc"):
+            dwc = lb.as_dwc()
+        result = {
+            "dwc": dwc,
+            "word_count": lb.word_count,
+            "valid_words": lb.valid_words,
+            "score": lb.score,
+        }
+        with self.lock:
+            self.db.execute(
+                "insert or replace into results values (?, ?)",
+                (self.key(lb), json.dumps(result)),
+            )
+            self.puts += 1
+            if self.puts % COMMIT_EVERY == 0:
+                self.db.commit()
+
+    def commit(self):
+        with self.lock:
+            self.db.commit()
+
+    def parse(
+        self,
+        labels: Iterable[Label],
+        parser: Callable[[Iterable[Label]], Iterator[Label]],
+    ) -> Iterator[Label]:
+        """
+        Only parse labels that are not in the cache.
+
+        Labels found in the cache are marked as cached and the parser passes them
+        through without parsing them. So the parser keeps the labels in order and a
+        cache hit only waits for the rest of its batch.
+        """
+
+        def looked_up():
+            for lb in labels:
+                lb.cached = self.get(lb)
+                yield lb
+
+        for lb in parser(looked_up()):
+            # Labels filtered out before parsing have no results
+            if lb.parsed and not lb.cached:
+                self.put(lb)
+            yield lb
+
+        self.commit()
@@ -13,6 +13,8 @@ from traiter.pylib.pipes import add, reject_match
 from traiter.pylib.rules import terms as t_terms
 from traiter.pylib.rules.base import Base
 
+from labels.pylib.lazy import LazyClassVar
+
 TOO_LONG = 2
 TOO_SHORT = 2
 
@@ -25,10 +27,15 @@ class AdminUnit(Base):
         Path(t_terms.__file__).parent / "us_location_terms.csv",
         Path(t_terms.__file__).parent / "other_location_terms.csv",
     ]
-    replace: ClassVar[dict[str, str]] = term_util.look_up_table(all_csvs, "replace")
-    county_in: ClassVar[dict[str, str]] = term_util.look_up_table(all_csvs, "inside")
-    county_in |= {k.lower(): v for k, v in county_in.items()}
-    postal: ClassVar[dict[str, str]] = term_util.look_up_table(all_csvs, "postal")
+    replace = LazyClassVar(
+        lambda cls: term_util.look_up_table(cls.all_csvs, "replace"),
+    )
+    county_in = LazyClassVar(
+        lambda cls: cls.get_county_in(),
+    )
+    postal = LazyClassVar(
+        lambda cls: term_util.look_up_table(cls.all_csvs, "postal"),
+    )
     state_ents: ClassVar[list[str]] = ["us_state", "us_state-us_county", "us_territory"]
     county_ents: ClassVar[list[str]] = ["us_county", "us_state-us_county"]
     admin_ents: ClassVar[list[str]] = [
@@ -76,6 +83,12 @@ class AdminUnit(Base):
 
         add.cleanup_pipe(nlp, name="admin_unit_cleanup")
 
+    @classmethod
+    def get_county_in(cls) -> dict[str, str]:
+        county_in = term_util.look_up_table(cls.all_csvs, "inside")
+        county_in |= {k.lower(): v for k, v in county_in.items()}
+        return county_in
+
     @classmethod
     def not_admin_unit(cls):
         decoder = {
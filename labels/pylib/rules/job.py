@@ -14,6 +14,8 @@ from traiter.pylib.pipes import add, reject_match
 from traiter.pylib.rules import terms as t_terms
 from traiter.pylib.rules.base import Base
 
+from labels.pylib.lazy import LazyClassVar
+
 TOO_LONG = 4
 
 
@@ -27,10 +29,12 @@ class Job(Base):
         Path(t_terms.__file__).parent / "name_terms.csv",
     ]
 
-    replace: ClassVar[dict[str, str]] = {
-        "".join(k.split()): v
-        for k, v in term_util.look_up_table(job_terms, "replace").items()
-    }
+    replace = LazyClassVar(
+        lambda cls: {
+            "".join(k.split()): v
+            for k, v in term_util.look_up_table(cls.job_terms, "replace").items()
+        },
+    )
 
     punct: ClassVar[list[str]] = "[.:;,_-]"
     and_: ClassVar[list[str]] = ["and", "with", "et"]
@@ -5,6 +5,8 @@ from spacy.language import Language
 from spacy.tokens import Doc
 from traiter.pylib.pipes import add
 
+from labels.pylib.ent_index import EntIndex
+
 
 def pipe(nlp: Language):
     config = {
@@ -35,7 +37,9 @@ class JobId:
     def __call__(self, doc: Doc) -> Doc:
         entities = []
 
-        for i, ent in enumerate(doc.ents):
+        index = EntIndex.of(doc)
+
+        for i, ent in enumerate(index.ents):
             if ent._.delete:
                 tu.clear_tokens(ent)
                 continue
@@ -44,10 +48,7 @@ class JobId:
                 entities.append(ent)
                 continue
 
-            beg = max(0, i - self.radius)
-            end = min(len(doc.ents), i + self.radius + 1)
-
-            labels = {lb for k in range(beg, end) if (lb := doc.ents[k].label_)}
+            labels = index.labels_near(i, self.radius)
             labels &= self.near
             labels -= {ent.label_}
 
@@ -57,5 +58,5 @@ class JobId:
 
             tu.clear_tokens(ent)
 
-        doc.ents = entities
+        EntIndex.set_ents(doc, entities)
         return doc
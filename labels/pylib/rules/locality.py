@@ -12,8 +12,12 @@ from traiter.pylib.pattern_compiler import Compiler
 from traiter.pylib.pipes import add, reject_match
 from traiter.pylib.rules.base import Base
 
+from labels.pylib.ent_index import EntIndex
+from labels.pylib.rules import repeat_until_stable
+
 USE_MOCK_TRAITER = 0
 TOO_LONG = 2
+EXTEND_PASSES = 4  # Most times the extend_locality pipe is run
 
 
 @dataclass(eq=False)
@@ -44,7 +48,7 @@ class Locality(Base):
         return t_dwc.DarwinCore.ns("verbatimLocality")
 
     @classmethod
-    def pipe(cls, nlp: Language):
+    def pipe(cls, nlp: Language, *, fused: bool = True):
         default_labels = {
             "locality_terms": "loc",
             "mock_locality_terms": "loc",
@@ -62,13 +66,24 @@ class Locality(Base):
         add.custom_pipe(nlp, registered="prune_localities")
         # add.debug_tokens(nlp)  # #############################################
 
-        for i in range(1, 5):
+        if fused:
             add.trait_pipe(
                 nlp,
-                name=f"extend_locality{i}",
+                name="extend_locality",
                 compiler=cls.extend_locality(),
                 overwrite=["locality", *cls.all_traits],
             )
+            repeat_until_stable.pipe(
+                nlp, pipe_name="extend_locality", max_passes=EXTEND_PASSES - 1
+            )
+        else:
+            for i in range(1, EXTEND_PASSES + 1):
+                add.trait_pipe(
+                    nlp,
+                    name=f"extend_locality{i}",
+                    compiler=cls.extend_locality(),
+                    overwrite=["locality", *cls.all_traits],
+                )
 
         # add.debug_tokens(nlp)  # #############################################
         add.trait_pipe(
@@ -286,9 +301,10 @@ def prune_localities(doc):  # noqa: C901
     ents = []
     add_locality = False
 
-    has_taxon = any(e._.trait and e._.trait._trait == "taxon" for e in doc.ents)
+    index = EntIndex.of(doc)
+    has_taxon = index.has_trait("taxon")
 
-    for i, ent in enumerate(doc.ents):
+    for i, ent in enumerate(index.ents):
         if not ent._.trait:
             continue
 
@@ -303,7 +319,7 @@ def prune_localities(doc):  # noqa: C901
             add_locality = True
 
         # Localities are before collector etc.
-        elif trait in {"collector", "date", "determiner"} and i > len(doc.ents) // 2:
+        elif trait in {"collector", "date", "determiner"} and i > len(index) // 2:
             add_locality = False
 
         elif trait == "locality":
@@ -325,5 +341,5 @@ def prune_localities(doc):  # noqa: C901
 
         ents.append(ent)
 
-    doc.set_ents(sorted(ents, key=lambda e: e.start))
+    EntIndex.set_ents(doc, sorted(ents, key=lambda e: e.start))
     return doc
@@ -10,6 +10,8 @@ from spacy.language import Language
 from spacy.tokens import Doc
 from traiter.pylib.pipes import add
 
+from labels.pylib.ent_index import EntIndex
+
 
 def pipe(nlp: Language):
     config = {
@@ -31,7 +33,7 @@ class PostProcess:
 
         rec_num_found = False
 
-        for ent in doc.ents[::-1]:
+        for ent in reversed(EntIndex.of(doc).ents):
             if ent.label_ in self.delete:
                 tu.clear_tokens(ent)
                 continue
@@ -49,4 +51,5 @@ class PostProcess:
 
         entities.reverse()
         doc.ents = entities
+        doc._.ent_index = None  # This is the last pipe, let the index go with it
         return doc
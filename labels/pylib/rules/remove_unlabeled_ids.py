@@ -1,11 +1,11 @@
 """Remove unlabeled ID number traits if there is one that is labeled."""
-from collections import defaultdict
-
 from flora.pylib import trait_util as tu
 from spacy.language import Language
 from spacy.tokens import Doc
 from traiter.pylib.pipes import add
 
+from labels.pylib.ent_index import EntIndex
+
 LABEL = "id_number"
 
 
@@ -25,24 +25,20 @@ class RemoveUnlabeledIds:
         self.name = name
 
     def __call__(self, doc: Doc) -> Doc:
-        entities = []
+        index = EntIndex.of(doc)
 
-        one_is_labeled = defaultdict(bool)
+        ids = [index.ents[i] for i in index.positions.get(LABEL, [])]
+        if not any(e._.trait.has_label for e in ids):
+            return doc
 
-        for ent in doc.ents:
-            if ent.label_ == LABEL:
-                one_is_labeled[ent.label_] |= bool(ent._.trait.has_label)
+        entities = []
 
-        for ent in doc.ents:
-            if (
-                ent.label_ == LABEL
-                and one_is_labeled[ent.label_]
-                and not ent._.trait.has_label
-            ):
+        for ent in index.ents:
+            if ent.label_ == LABEL and not ent._.trait.has_label:
                 tu.clear_tokens(ent)
                 continue
 
             entities.append(ent)
 
-        doc.ents = entities
+        EntIndex.set_ents(doc, entities)
         return doc
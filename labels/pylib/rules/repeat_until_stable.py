@@ -0,0 +1,52 @@
+"""
+Run a pipe again until it stops changing the entities.
+
+Some rules grow entities a little on every pass, so they were added to the pipeline
+several times. This runs one copy of the pipe up to max_passes more times and stops
+as soon as a pass leaves the entities and tokens as they were.
+"""
+
+from spacy.language import Language
+from spacy.tokens import Doc
+from traiter.pylib.pipes import add
+
+
+def pipe(nlp: Language, pipe_name: str, max_passes: int):
+    config = {
+        "pipe_name": pipe_name,
+        "max_passes": max_passes,
+    }
+    add.custom_pipe(nlp, "repeat_until_stable", config=config)
+
+
+@Language.factory("repeat_until_stable")
+class RepeatUntilStable:
+    def __init__(
+        self,
+        nlp: Language,
+        name: str,
+        pipe_name: str,
+        max_passes: int,
+    ):
+        super().__init__()
+        self.nlp = nlp
+        self.name = name
+        self.pipe_name = pipe_name  # The pipe to repeat
+        self.max_passes = max_passes  # Never run it more than this many extra times
+
+    def __call__(self, doc: Doc) -> Doc:
+        repeated = self.nlp.get_pipe(self.pipe_name)
+
+        before = state(doc)
+        for _ in range(self.max_passes):
+            doc = repeated(doc)
+            after = state(doc)
+            if after == before:
+                break
+            before = after
+
+        return doc
+
+
+def state(doc: Doc) -> tuple:
+    return len(doc), [(e.start, e.end, e.label_) for e in doc.ents]
@@ -16,6 +16,8 @@ from traiter.pylib.pipes import add, reject_match
 from traiter.pylib.rules import terms as t_terms
 from traiter.pylib.rules.base import Base
 
+from labels.pylib.lazy import LazyClassVar
+
 NAME_LEN: int = 2
 
 
@@ -52,45 +54,48 @@ def get_csvs() -> dict[str, Path]:
 @dataclass(eq=False)
 class Taxon(Base):
     # Class vars ----------
-    all_csvs: ClassVar[dict[str, Path]] = get_csvs()
-
-    rank_terms: ClassVar[list[dict]] = term_util.read_terms(all_csvs["rank_terms"])
+    all_csvs = LazyClassVar(lambda _cls: get_csvs())
+    rank_terms = LazyClassVar(
+        lambda cls: term_util.read_terms(cls.all_csvs["rank_terms"]),
+    )
 
     abbrev_re: ClassVar[str] = r"^[A-Z]?[.,_]?[A-Z][.,_]$"
     and_: ClassVar[list[str]] = ["&", "and", "et", "ex"]
-    any_rank: ClassVar[list[str]] = sorted({r["label"] for r in rank_terms})
+    any_rank = LazyClassVar(lambda cls: sorted({r["label"] for r in cls.rank_terms}))
     auth3: ClassVar[list[str]] = [
         s for s in t_const.NAME_SHAPES if len(s) > NAME_LEN and s[-1] != "."
     ]
     auth3_upper: ClassVar[list[str]] = [
         s for s in t_const.NAME_AND_UPPER if len(s) > NAME_LEN and s[-1] != "."
     ]
-    binomial_abbrev: ClassVar[dict[str, str]] = taxon_util.abbrev_binomial_term(
-        all_csvs["binomial_terms"],
+    binomial_abbrev = LazyClassVar(
+        lambda cls: taxon_util.abbrev_binomial_term(cls.all_csvs["binomial_terms"]),
+        sources=lambda cls: [cls.all_csvs["binomial_terms"]],
     )
     ambiguous: ClassVar[list[str]] = ["us_county", "color"]
-    higher_rank: ClassVar[list[str]] = sorted(
-        {r["label"] for r in rank_terms if r["level"] == "higher"},
+    higher_rank = LazyClassVar(
+        lambda cls: sorted(
+            {r["label"] for r in cls.rank_terms if r["level"] == "higher"},
+        ),
     )
-    level: ClassVar[dict[str, str]] = term_util.look_up_table(
-        all_csvs["rank_terms"],
-        "level",
+    level = LazyClassVar(
+        lambda cls: term_util.look_up_table(cls.all_csvs["rank_terms"], "level"),
     )
     linnaeus: ClassVar[list[str]] = "l l. lin lin. linn linn. linnaeus".split()
-    lower_rank: ClassVar[list[str]] = sorted(
-        {r["label"] for r in rank_terms if r["level"] == "lower"},
+    lower_rank = LazyClassVar(
+        lambda cls: sorted(
+            {r["label"] for r in cls.rank_terms if r["level"] == "lower"},
+        ),
     )
-    monomial_ranks: ClassVar[dict[str, str]] = term_util.look_up_table(
-        all_csvs["monomial_terms"],
-        "ranks",
+    monomial_ranks = LazyClassVar(
+        lambda cls: term_util.look_up_table(cls.all_csvs["monomial_terms"], "ranks"),
+        sources=lambda cls: [cls.all_csvs["monomial_terms"]],
     )
-    rank_abbrev: ClassVar[dict[str, str]] = term_util.look_up_table(
-        all_csvs["rank_terms"],
-        "abbrev",
+    rank_abbrev = LazyClassVar(
+        lambda cls: term_util.look_up_table(cls.all_csvs["rank_terms"], "abbrev"),
     )
-    rank_replace: ClassVar[dict[str, str]] = term_util.look_up_table(
-        all_csvs["rank_terms"],
-        "replace",
+    rank_replace = LazyClassVar(
+        lambda cls: term_util.look_up_table(cls.all_csvs["rank_terms"], "replace"),
     )
     # ---------------------
 
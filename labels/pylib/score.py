@@ -0,0 +1,76 @@
+"""
+Score label content in batches.
+
+score = the number of words in the label that are in the vocabulary divided by the
+        number of words in the label (words = all chars are letters)
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+import regex as re
+
+if TYPE_CHECKING:
+    from labels.pylib.label import Label
+    from labels.pylib.vocabulary import Vocabulary
+
+
+def split_words(text: str) -> list[str]:
+    return [t for t in re.split(r"[^\p{L}]+", text.lower()) if t]
+
+
+def score_texts(
+    texts: Sequence[str], vocabulary: "Vocabulary"
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the word_count, valid_words, and score arrays for the texts."""
+    words = [split_words(t) for t in texts]
+
+    word_count = np.array([len(w) for w in words], dtype=np.int64)
+    which = np.repeat(np.arange(len(texts)), word_count)
+
+    found = vocabulary.ids([w for ws in words for w in ws]) >= 0
+    valid_words = np.bincount(which, weights=found, minlength=len(texts))
+    valid_words = valid_words.astype(np.int64)
+
+    # Round Python floats, NumPy's rounding does not match the scores in older output
+    score = np.array(
+        [
+            round(int(v) / int(c), 2) if c else 0.0
+            for v, c in zip(valid_words, word_count, strict=True)
+        ],
+        dtype=np.float64,
+    )
+
+    return word_count, valid_words, score
+
+
+def score_labels(labels: Sequence["Label"], vocabulary: "Vocabulary"):
+    """Score labels that have their text already read."""
+    word_count, valid_words, score = score_texts([lb.text for lb in labels], vocabulary)
+    for lb, count, valid, score_ in zip(
+        labels, word_count, valid_words, score, strict=True
+    ):
+        lb.word_count = int(count)
+        lb.valid_words = int(valid)
+        lb.score = float(score_)
+
+
+def prefilter(
+    labels: Sequence["Label"],
+    vocabulary: "Vocabulary",
+    length_cutoff: int,
+    score_cutoff: float,
+) -> tuple[list["Label"], list["Label"]]:
+    """
+    Score labels and split them into the ones that pass the cutoffs and the rest.
+
+    This is cheap compared to parsing, so doing it before parsing keeps the labels
+    that will be filtered out anyway away from the nlp pipeline.
+    """
+    score_labels(labels, vocabulary)
+    kept, rejected = [], []
+    for lb in labels:
+        failed = lb.too_short(length_cutoff) or lb.bad_score(score_cutoff)
+        (rejected if failed else kept).append(lb)
+    return kept, rejected
@@ -0,0 +1,96 @@
+"""Find the labels that take the longest to parse and stop those that take too long."""
+
+import heapq
+import json
+import logging
+import signal
+from contextlib import contextmanager
+from pathlib import Path
+
+from labels.pylib.label import Label
+
+
+class LabelTimeout(Exception):
+    pass
+
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """
+    Raise LabelTimeout when the block runs longer than the given seconds.
+
+    This uses SIGALRM so it only works in a process's main thread. The signal is
+    handled between Python steps, so a single long call into compiled code finishes
+    before the label is stopped.
+    """
+    if not seconds:
+        yield
+        return
+
+    def expired(_signum, _frame):
+        raise LabelTimeout
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class SlowLabels:
+    """Keep the N slowest labels with the time each pipe took on them."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.heap = []
+        self.seen = 0
+
+    def add(self, lb: Label):
+        if not lb.parse_seconds:
+            return  # Not parsed here, e.g. cached or filtered out first
+        self.seen += 1
+        row = (lb.parse_seconds, self.seen, lb)
+        if len(self.heap) < self.count:
+            heapq.heappush(self.heap, row)
+        else:
+            heapq.heappushpop(self.heap, row)
+
+    def report(self) -> list[dict]:
+        rows = []
+        for seconds, _, lb in sorted(self.heap, reverse=True, key=lambda r: r[:2]):
+            components = sorted(
+                lb.component_seconds.items(), key=lambda c: c[1], reverse=True
+            )
+            rows.append(
+                {
+                    "stem": lb.path.stem,
+                    "seconds": seconds,
+                    "tokens": lb.token_count,
+                    "timed_out": lb.timed_out,
+                    "components": dict(components),
+                }
+            )
+        return rows
+
+    def table(self, top_components: int = 3) -> str:
+        lines = [f"{'stem':<40} {'seconds':>9} {'tokens':>7}  slowest pipes"]
+        for row in self.report():
+            pipes = list(row["components"].items())[:top_components]
+            pipes = ", ".join(f"{name} {secs:.3f}" for name, secs in pipes)
+            flag = " (timed out)" if row["timed_out"] else ""
+            lines.append(
+                f"{row['stem']:<40} {row['seconds']:9.3f} {row['tokens']:7d}  "
+                f"{pipes}{flag}"
+            )
+        return "\n".join(lines)
+
+    def log(self):
+        logging.info(f"The {len(self.heap)} slowest labels:\n{self.table()}")
+
+    def write(self, path: Path):
+        """Write the JSON report to the path and the table next to it."""
+        with path.open("w") as f:
+            json.dump(self.report(), f, indent=2)
+        path.with_suffix(".txt").write_text(self.table() + "\n")
@@ -0,0 +1,151 @@
+"""
+Read label texts from archives and manifests instead of a directory of text files.
+
+Every source lists its labels once, up front, as paths whose stems are the label IDs,
+so that --offset & --limit only slice that list. Texts are then read one at a time
+by random access, nothing is unpacked to disk.
+"""
+
+import csv
+import json
+import os
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class TextSource(ABC):
+    def __init__(self, path: Path):
+        self.path = path
+
+    def names(self) -> list[Path]:
+        """
+        List the labels as paths whose stems are the label IDs.
+
+        macOS resource forks are skipped. Every stem must be unique because it is the
+        label's ID in the output, and resuming skips labels by it.
+        """
+        names = [n for n in self.list_names() if not is_resource_fork(n)]
+
+        seen = {}
+        for name in names:
+            if name.stem in seen:
+                other = seen[name.stem]
+                msg = f"Stem '{name.stem}' is in {other} and {name} in {self.path}"
+                raise ValueError(msg)
+            seen[name.stem] = name
+
+        return names
+
+    @abstractmethod
+    def list_names(self) -> list[Path]:
+        """List every text file in the source."""
+
+    @abstractmethod
+    def read(self, name: Path, encoding: str = "utf8") -> str:
+        """Read the text of one label."""
+
+
+class ZipSource(TextSource):
+    """Text files in a zip archive, in name order."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.zip = zipfile.ZipFile(path)  # zipfile locks reads from many threads
+
+    def list_names(self) -> list[Path]:
+        return sorted(Path(n) for n in self.zip.namelist() if n.endswith(".txt"))
+
+    def read(self, name: Path, encoding: str = "utf8") -> str:
+        return self.zip.read(name.as_posix()).decode(encoding)
+
+
+class TarSource(TextSource):
+    """
+    Text files in an uncompressed tar archive, in name order.
+
+    A tar archive has no index so one pass over the headers builds one. Compressed
+    tar archives cannot be read at random, use zip for those.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.index = {}
+        with tarfile.open(path, "r:") as tar:
+            for info in tar:
+                if info.isfile() and info.name.endswith(".txt"):
+                    self.index[Path(info.name)] = (info.offset_data, info.size)
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def list_names(self) -> list[Path]:
+        return sorted(self.index)
+
+    def read(self, name: Path, encoding: str = "utf8") -> str:
+        offset, size = self.index[name]
+        return os.pread(self.fd, size, offset).decode(encoding)
+
+
+class JsonlSource(TextSource):
+    """A JSON Lines file of {"stem": ..., "text": ...} records, in file order."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.lines = []  # Keeps repeated stems so that names() can catch them
+        offset = 0
+        with path.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    name = Path(f"{json.loads(line)['stem']}.txt")
+                    self.lines.append((name, offset, len(line)))
+                offset += len(line)
+        self.index = {name: (offset, size) for name, offset, size in self.lines}
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def list_names(self) -> list[Path]:
+        return [name for name, *_ in self.lines]
+
+    def read(self, name: Path, encoding: str = "utf8") -> str:
+        offset, size = self.index[name]
+        line = os.pread(self.fd, size, offset).decode(encoding)
+        return json.loads(line)["text"]
+
+
+class CsvSource(TextSource):
+    """
+    A CSV manifest with a "path" column of text files, in file order.
+
+    Relative paths are relative to the manifest's directory. This skips listing a
+    huge directory.
+    """
+
+    def list_names(self) -> list[Path]:
+        with self.path.open(newline="") as f:
+            return [self.path.parent / row["path"] for row in csv.DictReader(f)]
+
+    def read(self, name: Path, encoding: str = "utf8") -> str:
+        with name.open(encoding=encoding) as f:
+            return f.read()
+
+
+def is_resource_fork(name: Path) -> bool:
+    """Check for the ._ files that macOS adds to archives."""
+    return "__MACOSX" in name.parts or name.name.startswith("._")
+
+
+SOURCES = {
+    ".zip": ZipSource,
+    ".tar": TarSource,
+    ".jsonl": JsonlSource,
+    ".csv": CsvSource,
+}
+
+
+def text_source(path: Path) -> TextSource | None:
+    """Get the source for an input file, a directory of text files has none."""
+    if path.is_dir():
+        return None
+    if path.suffix not in SOURCES:
+        msg = f"Label text must be in a directory or a {', '.join(SOURCES)} file"
+        raise ValueError(msg)
+    return SOURCES[path.suffix](path)
@@ -0,0 +1,108 @@
+"""Encode label images for HTML output in their own stage."""
+
+import base64
+import hashlib
+import io
+import warnings
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, UnidentifiedImageError
+
+from labels.pylib import artifacts
+from labels.pylib.image_index import ImageIndex
+from labels.pylib.label import Label
+from labels.pylib.metrics import Metrics
+
+MAX_SIZE = 600.0  # pixels
+CHUNK = 64  # Labels in flight at once
+
+
+class Thumbnails:
+    """
+    Shrink and base64 encode label images using a thread pool.
+
+    Thumbnails are cached on disk, when given a cache directory, keyed on the image
+    path and modification time.
+    """
+
+    def __init__(
+        self,
+        image_paths: ImageIndex | dict[str, Path],
+        cache_dir: Path | None = None,
+        threads: int | None = None,
+        metrics: Metrics | None = None,
+    ):
+        self.image_paths = image_paths
+        self.cache_dir = cache_dir / "thumbnails" if cache_dir else None
+        self.threads = threads
+        self.metrics = metrics or Metrics()
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Turn off EXIF warnings here, changing warning filters in the pool's threads
+        # is not thread safe
+        warnings.filterwarnings("ignore", category=UserWarning, module="PIL")
+
+    def add(self, labels: Iterable[Label]) -> Iterator[Label]:
+        """Add images to labels, the labels are returned in order."""
+        with ThreadPoolExecutor(self.threads) as executor:
+            chunk = []
+            for lb in labels:
+                lb.image_path = self.image_paths.get(lb.path.stem)
+                chunk.append(lb)
+                if len(chunk) == CHUNK:
+                    yield from executor.map(self.add_image, chunk)
+                    chunk = []
+            yield from executor.map(self.add_image, chunk)
+
+    def add_image(self, lb: Label) -> Label:
+        with self.metrics.stage("image"):
+            lb.encoded_image = self.get(lb.image_path)
+        return lb
+
+    def get(self, image_path: Path | None) -> str:
+        if not image_path:
+            return ""
+
+        if not self.cache_dir:
+            return encode(image_path)
+
+        try:
+            mtime = image_path.stat().st_mtime_ns
+        except OSError:
+            return ""
+
+        key = hashlib.sha256(f"{image_path.resolve()} {mtime} {MAX_SIZE}".encode())
+        path = self.cache_dir / f"{key.hexdigest()}.b64"
+        if path.exists():
+            return path.read_text()
+
+        string = encode(image_path)
+        temp = artifacts.temp_path(path)
+        temp.write_text(string)
+        temp.replace(path)
+        return string
+
+
+def encode(image_path: Path) -> str:
+    try:
+        image = Image.open(image_path)
+    except (FileNotFoundError, TypeError, ValueError, UnidentifiedImageError):
+        return ""
+
+    if image.size[1] > image.size[0]:
+        size = (round(MAX_SIZE / image.size[1] * image.size[0]), int(MAX_SIZE))
+    else:
+        size = (int(MAX_SIZE), round(MAX_SIZE / image.size[0] * image.size[1]))
+
+    # Let JPEGs decode at a reduced scale and reduce others before resampling
+    image.draft(image.mode, size)
+    image = image.resize(size, reducing_gap=3.0)
+
+    memory = io.BytesIO()
+    image.save(memory, format="JPEG")
+    image_bytes = memory.getvalue()
+
+    string = base64.b64encode(image_bytes).decode()
+    return string
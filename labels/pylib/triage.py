@@ -0,0 +1,148 @@
+"""
+Route labels past groups of trait pipes that cannot match them.
+
+Most herbarium labels have no floral morphology, township/range/section, or UTM
+traits. Looking only at the compressed text, triage finds the groups of trait pipes
+that cannot match anything in a label so that they are disabled while it is parsed.
+
+A group is skipped only when none of its trigger words are in the text. The trigger
+words are the first word of every term in the term files of the group's rules. Terms
+without letters or digits, like ♂ or ♀, are looked for in the text as they are. If a
+rule's term files cannot be found, its group only uses the digit check, or is never
+skipped. The geo and ID number rules all need numbers.
+"""
+
+from functools import cache
+from pathlib import Path
+
+import regex as re
+from flora.pylib.rules.color import Color
+from flora.pylib.rules.duration import Duration
+from flora.pylib.rules.flower_location import FlowerLocation
+from flora.pylib.rules.flower_morphology import FlowerMorphology
+from flora.pylib.rules.leaf_duration import LeafDuration
+from flora.pylib.rules.leaf_folding import LeafFolding
+from flora.pylib.rules.margin import Margin
+from flora.pylib.rules.morphology import Morphology
+from flora.pylib.rules.odor import Odor
+from flora.pylib.rules.plant_duration import PlantDuration
+from flora.pylib.rules.reproduction import Reproduction
+from flora.pylib.rules.sex import Sex
+from flora.pylib.rules.shape import Shape
+from flora.pylib.rules.surface import Surface
+from flora.pylib.rules.venation import Venation
+from flora.pylib.rules.woodiness import Woodiness
+from traiter.pylib import term_util
+from traiter.pylib.rules.trs import TRS
+from traiter.pylib.rules.utm import UTM
+
+from labels.pylib import pipeline
+
+# The rules in each trait group, the groups are marked in pipeline.build()
+GROUP_RULES = {
+    "floral": [
+        Color,
+        Duration,
+        FlowerLocation,
+        FlowerMorphology,
+        LeafDuration,
+        LeafFolding,
+        Margin,
+        Morphology,
+        Odor,
+        PlantDuration,
+        Reproduction,
+        Sex,
+        Shape,
+        Surface,
+        Venation,
+        Woodiness,
+    ],
+    "geo": [TRS, UTM],
+    "id_number": [],  # Unlabeled ID numbers have no terms, only digits
+}
+
+NEEDS_DIGITS = {"geo", "id_number"}
+
+DIGIT = re.compile(r"\d")
+
+SUFFIXES = {".csv", ".zip"}  # Term files
+
+
+class Triage:
+    def __init__(self, nlp):
+        self.groups: dict[str, list[str]] = nlp.meta.get(pipeline.TRAIT_GROUPS, {})
+
+    def route(self, text: str) -> frozenset[str]:
+        """Get the trait groups that can be skipped for this text."""
+        skip = set()
+        has_digits = bool(DIGIT.search(text))
+        lowered = text.lower()
+        words = None
+
+        for group in self.groups:
+            if group in NEEDS_DIGITS and not has_digits:
+                skip.add(group)
+                continue
+
+            triggers = group_triggers(group)
+            if triggers is None:
+                continue
+
+            trigger_words, symbols = triggers
+            words = words if words is not None else set(split_words(text))
+            if words & trigger_words:
+                continue
+            if any(s in lowered for s in symbols):
+                continue
+            skip.add(group)
+
+        return frozenset(skip)
+
+    def disable(self, route: frozenset[str]) -> list[str]:
+        """Get the pipe names to disable for a route."""
+        return [name for group in sorted(route) for name in self.groups[group]]
+
+
+def split_words(text: str) -> list[str]:
+    """Split text into runs of letters or digits, tokens never split these further."""
+    return re.findall(r"\p{L}+|\p{N}+", text.lower())
+
+
+@cache
+def group_triggers(group: str) -> tuple[frozenset[str], frozenset[str]] | None:
+    """
+    Get the first word of every term in the group and the terms that have no words.
+
+    None if they can't be known.
+    """
+    rules = GROUP_RULES.get(group)
+    if not rules:
+        return None
+
+    triggers, symbols = set(), set()
+    for rule in rules:
+        paths = term_paths(rule)
+        if not paths:
+            return None
+        for path in paths:
+            for term in term_util.read_terms(path):
+                pattern = term["pattern"].lower()
+                if words := split_words(pattern):
+                    triggers.add(words[0])
+                elif pattern.strip():
+                    symbols.add(pattern.strip())
+
+    return frozenset(triggers), frozenset(symbols)
+
+
+def term_paths(rule: type) -> list[Path]:
+    """Find the term files that a rule class keeps in its class variables."""
+    paths = []
+    for value in vars(rule).values():
+        if isinstance(value, dict):
+            value = list(value.values())
+        if not isinstance(value, list | tuple):
+            value = [value]
+        paths += [v for v in value if isinstance(v, Path) and v.suffix in SUFFIXES]
+    return paths
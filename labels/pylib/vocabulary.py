@@ -0,0 +1,128 @@
+"""
+A persisted vocabulary for scoring label content.
+
+Building the vocabulary means reading every word from the spell checker and splitting
+all binomial and monomial taxon terms. That takes several seconds and a lot of memory,
+so it is done once and saved as a sorted table of byte strings. The table is memory
+mapped when it is needed and lookups are binary searches. It is rebuilt when any of
+its source files change.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import numpy as np
+from flora.pylib.rules import terms as f_terms
+from spell_well.pylib.spell_well import SpellWell
+from traiter.pylib import term_util
+
+from labels.pylib import artifacts
+
+INDEX = "vocabulary.npy"
+META = "vocabulary.json"
+
+BINOMIAL_TERMS = Path(f_terms.__file__).parent / "binomial_terms.zip"
+MONOMIAL_TERMS = Path(f_terms.__file__).parent / "monomial_terms.zip"
+
+
+class Vocabulary:
+    def __init__(
+        self, index_dir: Path = artifacts.ARTIFACT_DIR, *, checked: bool = False
+    ):
+        self.index_dir = index_dir
+        self.checked = checked  # The index is known to be current, e.g. in workers
+        self.words: np.ndarray | None = None
+
+    def __contains__(self, word: str) -> bool:
+        words = self.load()
+        key = word.encode()
+        if len(key) > words.itemsize:
+            return False
+        i = np.searchsorted(words, key)
+        return bool(i < len(words) and words[i] == key)
+
+    def ids(self, words: list[str]) -> np.ndarray:
+        """Intern the words as their positions in the index, -1 when not found."""
+        table = self.load()
+        ids = np.full(len(words), -1, dtype=np.int64)
+        if not words or not len(table):
+            return ids
+
+        # Words longer than any in the index are not in it. Leaving them out also
+        # keeps one long OCR garbage word from making every key that wide.
+        encoded = [w.encode() for w in words]
+        fits = [i for i, e in enumerate(encoded) if len(e) <= table.itemsize]
+        if not fits:
+            return ids
+
+        keys = np.array([encoded[i] for i in fits], dtype=table.dtype)
+        found = np.minimum(np.searchsorted(table, keys), len(table) - 1)
+        ids[fits] = np.where(table[found] == keys, found, -1)
+        return ids
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def load(self) -> np.ndarray:
+        """Memory map the index, build it first if it is missing or stale."""
+        if self.words is None:
+            if not self.checked and self.is_stale():
+                self.build()
+            self.words = np.load(self.index_dir / INDEX, mmap_mode="r")
+        return self.words
+
+    def is_stale(self) -> bool:
+        meta = self.index_dir / META
+        if not meta.exists() or not (self.index_dir / INDEX).exists():
+            return True
+        with meta.open() as f:
+            return json.load(f).get("fingerprint") != fingerprint()
+
+    def build(self):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        words = sorted(w.encode() for w in read_words())
+        words = np.array(words, dtype=np.bytes_)
+
+        temp_index = artifacts.temp_path(self.index_dir / INDEX)
+        with temp_index.open("wb") as f:
+            np.save(f, words)
+        temp_index.replace(self.index_dir / INDEX)
+
+        temp_meta = artifacts.temp_path(self.index_dir / META)
+        with temp_meta.open("w") as f:
+            json.dump({"fingerprint": fingerprint(), "count": len(words)}, f)
+        temp_meta.replace(self.index_dir / META)
+
+
+def read_words() -> set[str]:
+    """Get words for scoring label content from their sources."""
+    spell_well = SpellWell()
+    vocabulary = {w.lower() for w in spell_well.vocab_to_set()}
+
+    for term in term_util.read_terms(BINOMIAL_TERMS):
+        vocabulary |= set(term["pattern"].lower().split())
+
+    vocabulary |= {t["pattern"] for t in term_util.read_terms(MONOMIAL_TERMS)}
+
+    return vocabulary
+
+
+def sources() -> list[Path]:
+    """Get the data files of the vocabulary, Python and its caches are left out."""
+    spell_well = importlib.util.find_spec("spell_well").submodule_search_locations
+    paths = [p for r in spell_well for p in sorted(Path(r).rglob("*")) if is_data(p)]
+    return [*paths, BINOMIAL_TERMS, MONOMIAL_TERMS]
+
+
+def is_data(path: Path) -> bool:
+    return (
+        path.is_file()
+        and path.suffix not in {".py", ".pyc", ".pyo"}
+        and "__pycache__" not in path.parts
+    )
+
+
+def fingerprint() -> str:
+    return artifacts.fingerprint(sources())
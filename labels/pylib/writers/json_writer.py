@@ -0,0 +1,180 @@
+"""Write DwC records as the labels are parsed."""
+
+import io
+import json
+import logging
+import tarfile
+import textwrap
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from labels.pylib import artifacts
+from labels.pylib.label import Label
+
+# Flush JSON Lines output after this many records or seconds, whichever comes first
+FLUSH_EVERY = 100
+FLUSH_SECONDS = 5.0
+
+# Threads writing per-label files and how many writes may be waiting on them
+THREADS = 8
+MAX_PENDING = 1000
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def record(lb: Label) -> dict:
+    rec = {
+        "image": lb.path.stem,
+        "word_count": lb.word_count,
+        "valid_words": lb.valid_words,
+        "score": lb.score,
+    }
+    rec |= lb.as_dwc()
+    return rec
+
+
+class JsonWriter:
+    """
+    Write all records to a single JSON file, one record at a time.
+
+    Records go to a temporary file that replaces the output when it is closed, so a
+    crash leaves any earlier output as it was.
+    """
+
+    def __init__(self, json_output: Path):
+        self.json_output = json_output
+        self.temp = artifacts.temp_path(json_output)
+        self.file = self.temp.open("w")
+        self.count = 0
+
+    def write(self, lb: Label):
+        self.write_record(record(lb))
+
+    def write_record(self, rec: dict):
+        # Same layout as json.dump(records, f, indent=2)
+        text = textwrap.indent(json.dumps(rec, indent=2), "  ")
+        self.file.write(("[\n" if self.count == 0 else ",\n") + text)
+        self.count += 1
+
+    def close(self):
+        self.file.write("\n]" if self.count else "[]")
+        self.file.close()
+        self.temp.replace(self.json_output)
+
+
+class JsonLinesWriter:
+    """
+    Write one record per line and flush regularly so that a crash loses little.
+
+    An existing file is appended to. The stems already in it are in self.done so that
+    a restarted run can skip them. A partial last line left by a crash is cut off.
+    """
+
+    def __init__(self, json_output: Path):
+        self.done: set[str] = self.read_done(json_output)
+        self.file = json_output.open("a")
+        self.count = 0
+        self.flushed = time.monotonic()
+
+    @staticmethod
+    def read_done(json_output: Path) -> set[str]:
+        done = set()
+        if not json_output.exists():
+            return done
+
+        good = 0  # Byte offset just past the last complete record
+        with json_output.open("rb") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["image"])
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError):
+                    break
+                good += len(line)
+
+        with json_output.open("r+b") as f:
+            if good < json_output.stat().st_size:
+                logging.warning(f"Cutting off a partial record in {json_output}")
+                f.truncate(good)
+            if good:
+                f.seek(good - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+        return done
+
+    def write(self, lb: Label):
+        self.write_record(record(lb))
+
+    def write_record(self, rec: dict):
+        self.file.write(json.dumps(rec) + "\n")
+        self.done.add(rec["image"])
+        self.count += 1
+        now = time.monotonic()
+        if self.count % FLUSH_EVERY == 0 or now - self.flushed > FLUSH_SECONDS:
+            self.file.flush()
+            self.flushed = now
+
+    def close(self):
+        self.file.close()
+
+
+class TraiterDirWriter:
+    """
+    Write one JSON file per label.
+
+    The files are written by a thread pool because on network file systems the time
+    goes to opening and closing files, not to writing them.
+    """
+
+    def __init__(self, traiter_dir: Path, threads: int = THREADS):
+        self.traiter_dir = traiter_dir
+        self.traiter_dir.mkdir(parents=True, exist_ok=True)
+        self.pool = ThreadPoolExecutor(threads)
+        self.pending = deque()
+
+    def write(self, lb: Label):
+        path = self.traiter_dir / f"{lb.path.stem}.json"
+        # One dumps() & write() is much faster than dump() writing every token
+        text = json.dumps(lb.as_dwc(), indent=4)
+        self.pending.append(self.pool.submit(path.write_text, text))
+        while len(self.pending) > MAX_PENDING:
+            self.pending.popleft().result()  # Also raises any write errors
+
+    def close(self):
+        while self.pending:
+            self.pending.popleft().result()
+        self.pool.shutdown()
+
+
+class TraiterArchiveWriter:
+    """Write the per-label JSON files into one zip or tar archive."""
+
+    def __init__(self, archive: Path):
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        self.archive = archive
+        if archive.suffix == ".zip":
+            self.file = zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED)
+        else:
+            mode = "w" if archive.suffix == ".tar" else "w:gz"
+            self.file = tarfile.open(archive, mode)  # noqa: SIM115
+
+    @staticmethod
+    def is_archive(path: Path) -> bool:
+        return path.name.endswith(ARCHIVE_SUFFIXES)
+
+    def write(self, lb: Label):
+        name = f"{lb.path.stem}.json"
+        data = json.dumps(lb.as_dwc(), indent=4).encode()
+        if isinstance(self.file, zipfile.ZipFile):
+            self.file.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.file.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.file.close()
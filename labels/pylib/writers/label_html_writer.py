@@ -3,8 +3,8 @@ from pathlib import Path
 
 from flora.pylib.writers.html_writer import HtmlWriter as BaseWriter
 from flora.pylib.writers.html_writer import HtmlWriterRow as BaseWriterRow
-from tqdm import tqdm
 
+from labels.pylib.label import Label
 from labels.pylib.labels import Labels
 
 
@@ -26,27 +26,29 @@ class HtmlWriter(BaseWriter):
             spotlight=spotlight,
         )
 
+    def add(self, lb: Label):
+        self.formatted.append(
+            HtmlWriterRow(
+                label_id=lb.path.stem,
+                formatted_text=self.format_text(lb, exclude=["trs"]),
+                formatted_traits=self.format_traits(lb),
+                label_image=lb.encoded_image,
+                word_count=lb.word_count,
+                valid_words=lb.valid_words,
+                score=lb.score,
+            ),
+        )
+
     def write(self, labels: Labels, args=None):
-        for lb in tqdm(labels.labels, desc="write"):
-            self.formatted.append(
-                HtmlWriterRow(
-                    label_id=lb.path.stem,
-                    formatted_text=self.format_text(lb, exclude=["trs"]),
-                    formatted_traits=self.format_traits(lb),
-                    label_image=lb.encoded_image,
-                    word_count=lb.word_count,
-                    valid_words=lb.valid_words,
-                    score=lb.score,
-                ),
-            )
-
-        total_removed = labels.score_too_low + labels.too_short
+        """Write the HTML file of the rows from add() with the counts in labels."""
+        total_removed = labels.score_too_low + labels.too_short + labels.timed_out
         summary = {
             "Total labels:": labels.unfiltered_count,
-            "Kept:": len(labels.labels),
+            "Kept:": labels.kept,
             "Total removed:": total_removed,
             "Too short:": labels.too_short,
             "Score too low:": labels.score_too_low,
+            "Timed out:": labels.timed_out,
             "Length cutoff:": args.length_cutoff,
             "Score cutoff:": args.score_cutoff,
         }
@@ -0,0 +1,80 @@
+"""Write DwC records to a Parquet file in row groups as the labels are parsed."""
+
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from labels.pylib.dwc_terms import TERMS
+from labels.pylib.label import Label
+
+ROW_GROUP = 10_000
+
+# Any term that is not in the DwC term list goes into this column as JSON
+OTHER_TERMS = "other_terms"
+
+# Every row group has the same schema, one column per DwC term. DwC values are text,
+# anything else, like dynamicProperties, is written as JSON.
+SCHEMA = pa.schema(
+    [
+        ("image", pa.string()),
+        ("word_count", pa.int64()),
+        ("valid_words", pa.int64()),
+        ("score", pa.float64()),
+        *((term, pa.string()) for term in TERMS),
+        (OTHER_TERMS, pa.string()),
+    ]
+)
+
+
+class ParquetWriter:
+    """Buffer records and write each full buffer as a Parquet row group."""
+
+    def __init__(self, parquet_output: Path, row_group: int = ROW_GROUP):
+        self.writer = pq.ParquetWriter(parquet_output, SCHEMA)
+        self.row_group = row_group
+        self.rows = {name: [] for name in SCHEMA.names}
+        self.count = 0
+        self.warned = set()
+
+    def write(self, lb: Label):
+        self.rows["image"].append(lb.path.stem)
+        self.rows["word_count"].append(lb.word_count)
+        self.rows["valid_words"].append(lb.valid_words)
+        self.rows["score"].append(lb.score)
+
+        dwc = dict(lb.as_dwc())
+        for term in TERMS:
+            value = dwc.pop(term, None)
+            self.rows[term].append(
+                value if value is None or isinstance(value, str) else json.dumps(value)
+            )
+        self.rows[OTHER_TERMS].append(json.dumps(dwc) if dwc else None)
+        self.warn(dwc)
+
+        self.count += 1
+        if self.count >= self.row_group:
+            self.flush()
+
+    def warn(self, others: dict):
+        if new := set(others) - self.warned:
+            logging.warning(f"Terms not in the DwC term list: {', '.join(sorted(new))}")
+            self.warned |= new
+
+    def flush(self):
+        if self.count:
+            self.writer.write_table(pa.table(self.rows, schema=SCHEMA))
+            self.rows = {name: [] for name in SCHEMA.names}
+            self.count = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def read_parquet(parquet_output: Path) -> pd.DataFrame:
+    """Read records written by ParquetWriter without the terms no label has."""
+    return pd.read_parquet(parquet_output).dropna(axis="columns", how="all")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import socketserver
+import textwrap
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from util.pylib import log
+
+from labels.pylib import pipeline
+from labels.pylib.label import Label
+from labels.pylib.vocabulary import Vocabulary
+from labels.pylib.writers.json_writer import record
+
+
+class LabelParser:
+    """One warm pipeline shared by all requests."""
+
+    def __init__(self, pipeline_dir: Path | None, *, lean: bool = False):
+        self.nlp = pipeline.load(pipeline_dir, lean=lean)
+        self.vocabulary = Vocabulary()
+        self.vocabulary.load()
+        self.lock = threading.Lock()  # spaCy pipelines are not thread safe
+        self.parse({"text": "Warm up the pipeline."})
+
+    def parse(self, request: dict) -> dict:
+        lb = Label.from_text(request["text"], request.get("image", "label"))
+        with self.lock:
+            lb.parse_text(self.nlp, self.vocabulary)
+        return record(lb)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    POST /parse takes {"text": ..., "image": ...} or a list of them.
+
+    The response holds the same records as --json-output. Errors are returned as
+    {"error": ...} with a 400 status for bad requests or 500 when parsing fails.
+    GET /health says the service is up.
+    """
+
+    parser: LabelParser = None
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json({"status": "ok"})
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def do_POST(self):
+        if self.path != "/parse":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            body = self.read_body()
+        except (ValueError, TypeError) as err:
+            self.send_json({"error": f"Bad request: {err}"}, HTTPStatus.BAD_REQUEST)
+            return
+
+        try:
+            if isinstance(body, list):
+                result = [self.parser.parse(r) for r in body]
+            else:
+                result = self.parser.parse(body)
+        except Exception as err:
+            # Keep serving, one label must not take the service down
+            logging.exception("Parse failed")
+            self.send_json(
+                {"error": f"Parse failed: {err}"}, HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+            return
+
+        self.send_json(result)
+
+    def read_body(self) -> dict | list[dict]:
+        """Read a request or a list of them, raise an error if one is malformed."""
+        try:
+            size = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            msg = "Content-Length is not a number"
+            raise ValueError(msg) from None
+
+        body = json.loads(self.rfile.read(size))  # JSONDecodeError is a ValueError
+
+        for request in body if isinstance(body, list) else [body]:
+            if not isinstance(request, dict):
+                msg = "Send an object or a list of objects"
+                raise TypeError(msg)
+            if not isinstance(request.get("text"), str):
+                msg = 'Every request needs a "text" string'
+                raise TypeError(msg)
+            if not isinstance(request.get("image", ""), str):
+                msg = 'The "image" must be a string'
+                raise TypeError(msg)
+
+        return body
+
+    def send_json(self, data, status: HTTPStatus = HTTPStatus.OK):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):  # noqa: A002
+        logging.info(f"{self.address_string()} {format % args}")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    log.started()
+    args = parse_args()
+
+    Handler.parser = LabelParser(args.pipeline_dir, lean=args.lean)
+
+    if args.socket:
+        args.socket.unlink(missing_ok=True)
+        server = UnixHTTPServer(str(args.socket), Handler)
+        logging.info(f"Serving on {args.socket}")
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+        logging.info(f"Serving on http://127.0.0.1:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket:
+            args.socket.unlink(missing_ok=True)
+
+    log.finished()
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=textwrap.dedent(
+            """
+            Keep the label parser loaded and parse label text sent to it over a
+            local HTTP port or a Unix socket. This skips the parser start up cost
+            that every parse-labels run pays.
+
+            POST /parse with {"text": "label text", "image": "file stem"} or a
+            list of those. The image is optional. The response has the same
+            records as parse-labels --json-output:
+                curl -d '{"text": "..."}' http://127.0.0.1:8000/parse
+            """,
+        ),
+    )
+
+    arg_parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        metavar="INT",
+        help="""Listen on this port on localhost. (default: %(default)s)""",
+    )
+
+    arg_parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        type=Path,
+        help="""Listen on this Unix socket instead of a port.""",
+    )
+
+    arg_parser.add_argument(
+        "--pipeline-dir",
+        metavar="PATH",
+        type=Path,
+        help="""Load the parser saved in this directory by build-pipeline instead of
+            building it.""",
+    )
+
+    arg_parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="""Use the lean parser, see parse-labels --lean.""",
+    )
+
+    args = arg_parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Gather the texts the rule tests parse so that pipeline variants can be compared."""
+
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import traiter.pylib.darwin_core as t_dwc
+
+from tests import setup
+
+TESTS = Path(__file__).parent
+
+
+def rule_test_texts() -> list[str]:
+    """Run the rule & DwC tests and return every text that they parse."""
+    texts = []
+    pipeline = setup.PIPELINE
+
+    def record(text, *args, **kwargs):
+        texts.append(text)
+        return pipeline(text, *args, **kwargs)
+
+    with patch.object(setup, "PIPELINE", record):
+        for subdir in ("rules", "dwc"):
+            suite = unittest.defaultTestLoader.discover(
+                str(TESTS / subdir), top_level_dir=str(TESTS.parent)
+            )
+            suite.run(unittest.TestResult())
+
+    return list(dict.fromkeys(texts))
+
+
+def as_dwc(doc) -> dict:
+    dwc = t_dwc.DarwinCore()
+    _ = [e._.trait.to_dwc(dwc) for e in doc.ents]
+    return dwc.to_dict()
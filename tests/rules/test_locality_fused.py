@@ -0,0 +1,33 @@
+from functools import cache
+from unittest.mock import patch
+
+from traiter.pylib.util import compress
+
+from labels.pylib import pipeline
+from tests import setup
+from tests.rules import test_locality
+
+
+@cache
+def cascade():
+    """Build the original pipeline that runs extend_locality four times in a row."""
+    return pipeline.build(fused_locality=False)
+
+
+def parse_both(text: str) -> list:
+    """Parse with both pipelines and make sure that they agree."""
+    fused = setup.parse(text)
+    cascaded = [e._.trait for e in cascade()(compress(text)).ents]
+    if fused != cascaded:
+        msg = f"Fused and cascaded locality pipes differ for: {text!r}"
+        raise AssertionError(msg)
+    return fused
+
+
+class TestLocalityFused(test_locality.TestLocality):
+    """Run all of the locality tests on both pipelines."""
+
+    def setUp(self):
+        patcher = patch.object(test_locality, "parse", parse_both)
+        patcher.start()
+        self.addCleanup(patcher.stop)
@@ -1,9 +1,14 @@
+import os
+from pathlib import Path
+
 import traiter.pylib.darwin_core as t_dwc
 from traiter.pylib.util import compress
 
 from labels.pylib import pipeline
 
-PIPELINE = pipeline.build()
+PIPELINE_DIR = os.getenv("PIPELINE_DIR")
+
+PIPELINE = pipeline.load(Path(PIPELINE_DIR) if PIPELINE_DIR else None)
 
 
 def parse(text: str) -> list:
@@ -0,0 +1,62 @@
+import unittest
+from types import SimpleNamespace
+
+import spacy
+from spacy.tokens import Span
+
+from labels.pylib.ent_index import EntIndex
+
+if not Span.has_extension("trait"):
+    Span.set_extension("trait", default=None)
+
+
+def trait(name: str) -> SimpleNamespace:
+    return SimpleNamespace(_trait=name)
+
+
+class TestEntIndex(unittest.TestCase):
+    def setUp(self):
+        self.nlp = spacy.blank("en")
+        self.doc = self.nlp("Quercus alba near Lake Ellen in Zim County")
+        self.doc.ents = [
+            Span(self.doc, 0, 2, label="taxon"),
+            Span(self.doc, 3, 5, label="locality"),
+            Span(self.doc, 6, 8, label="admin_unit"),
+        ]
+
+    def test_ent_index_of_reuses_index(self):
+        index = EntIndex.of(self.doc)
+        self.assertEqual(index.labels, ["taxon", "locality", "admin_unit"])
+        self.assertEqual(index.positions["locality"], [1])
+        self.assertIs(EntIndex.of(self.doc), index)
+
+    def test_ent_index_of_rebuilds_when_ents_change(self):
+        index = EntIndex.of(self.doc)
+        self.doc.ents = [Span(self.doc, 0, 2, label="taxon")]
+        rebuilt = EntIndex.of(self.doc)
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.labels, ["taxon"])
+        self.assertEqual(len(rebuilt), 1)
+
+    def test_ent_index_set_ents(self):
+        EntIndex.of(self.doc)
+        ents = [Span(self.doc, 3, 5, label="locality")]
+        index = EntIndex.set_ents(self.doc, ents)
+        self.assertEqual([e.label_ for e in self.doc.ents], ["locality"])
+        self.assertIs(index.ents, ents)
+        self.assertIs(EntIndex.of(self.doc), index)
+
+    def test_ent_index_has_trait_sees_swapped_traits(self):
+        self.doc.ents[0]._.trait = trait("taxon")
+        index = EntIndex.of(self.doc)
+        self.assertTrue(index.has_trait("taxon"))
+
+        self.doc.ents[0]._.trait = trait("locality")
+        self.assertIs(EntIndex.of(self.doc), index)
+        self.assertFalse(index.has_trait("taxon"))
+        self.assertTrue(index.has_trait("locality"))
+
+    def test_ent_index_labels_near(self):
+        index = EntIndex.of(self.doc)
+        self.assertEqual(index.labels_near(0, 1), {"taxon", "locality"})
+        self.assertEqual(len(index.labels_near(1, 5)), 3)
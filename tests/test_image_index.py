@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from labels.pylib.image_index import LIST_ABOVE, ImageIndex
+
+
+class TestImageIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.image_dir = Path(self.temp_dir.name) / "images"
+        self.image_dir.mkdir()
+        for name in ("a.jpg", "b.JPG", "c.TIF", "d.TIFF", "e.webp", "f.txt", "g.png"):
+            (self.image_dir / name).touch()
+        (self.image_dir / "g.jpg").touch()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def lookups(self, index: ImageIndex) -> dict[str, str | None]:
+        stems = ["a", "b", "c", "d", "e", "f", "g", "h"]
+        return {s: p.name if (p := index.get(s)) else None for s in stems}
+
+    def test_image_index_stat_and_listing_agree(self):
+        expect = {
+            "a": "a.jpg",
+            "b": "b.JPG",
+            "c": "c.TIF",
+            "d": "d.TIFF",
+            "e": "e.webp",
+            "f": None,
+            "g": "g.jpg",
+            "h": None,
+        }
+        stat = ImageIndex(self.image_dir)
+        self.assertIsNone(stat.index)
+        self.assertEqual(self.lookups(stat), expect)
+
+        listed = ImageIndex(self.image_dir, label_count=LIST_ABOVE)
+        self.assertIsNotNone(listed.index)
+        self.assertEqual(self.lookups(listed), expect)
+
+    def test_image_index_saved_listing(self):
+        cache_dir = Path(self.temp_dir.name) / "cache"
+        first = ImageIndex(self.image_dir, cache_dir, LIST_ABOVE)
+        self.assertTrue(first.index_path.exists())
+
+        # A small run reuses the listing of a large one
+        second = ImageIndex(self.image_dir, cache_dir)
+        self.assertEqual(second.index, first.index)
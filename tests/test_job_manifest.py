@@ -0,0 +1,81 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from labels.pylib.job_manifest import JobManifest
+from labels.pylib.writers.json_writer import JsonLinesWriter
+
+PATHS = [Path(f"text/label_{i}.txt") for i in range(5)]
+
+
+def write_shard(shard, stems):
+    writer = JsonLinesWriter(shard.output)
+    for stem in stems:
+        if stem not in writer.done:
+            writer.write_record({"image": stem, "dwc:verbatimLabel": stem.upper()})
+    writer.close()
+
+
+class TestJobManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.job_dir = Path(self.temp_dir.name) / "job"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_job_manifest_shards(self):
+        manifest = JobManifest(self.job_dir, PATHS, 2)
+        shards = list(manifest.shards())
+        self.assertEqual([len(s.paths) for s in shards], [2, 2, 1])
+        self.assertEqual(list(manifest.pending()), shards)
+
+    def test_job_manifest_other_paths(self):
+        JobManifest(self.job_dir, PATHS, 2)
+        with self.assertRaises(ValueError):  # noqa: PT027
+            JobManifest(self.job_dir, PATHS[:4], 2)
+        with self.assertRaises(ValueError):  # noqa: PT027
+            JobManifest(self.job_dir, PATHS, 3)
+
+    def test_job_manifest_resume_partial_shard(self):
+        manifest = JobManifest(self.job_dir, PATHS, 2)
+        first, second, _ = manifest.shards()
+        write_shard(first, [p.stem for p in first.paths])
+        manifest.complete(first)
+
+        # Crash part way through the second shard's last record
+        write_shard(second, [second.paths[0].stem])
+        with second.output.open("a") as f:
+            f.write('{"image": "label_3", "dwc:verb')
+
+        manifest = JobManifest(self.job_dir, PATHS, 2)
+        checkpoint = json.loads((self.job_dir / "checkpoint.json").read_text())
+        self.assertEqual(checkpoint, {"completed": [0]})
+        self.assertEqual([s.index for s in manifest.pending()], [1, 2])
+
+        self.assertEqual(JsonLinesWriter(second.output).done, {"label_2"})
+
+    def test_job_manifest_merge(self):
+        manifest = JobManifest(self.job_dir, PATHS, 2)
+        first, second, _ = manifest.shards()
+        write_shard(first, [p.stem for p in first.paths])
+        manifest.complete(first)
+        write_shard(second, [second.paths[0].stem])  # Cut off
+
+        manifest = JobManifest(self.job_dir, PATHS, 2)
+        for shard in manifest.pending():
+            write_shard(shard, [p.stem for p in shard.paths])
+            manifest.complete(shard)
+        self.assertEqual(list(manifest.pending()), [])
+
+        json_output = Path(self.temp_dir.name) / "output.jsonl"
+        manifest.merge(json_output)
+        with json_output.open() as f:
+            stems = [json.loads(ln)["image"] for ln in f]
+        self.assertEqual(stems, [p.stem for p in PATHS])
+
+        json_output = Path(self.temp_dir.name) / "output.json"
+        manifest.merge(json_output)
+        records = json.loads(json_output.read_text())
+        self.assertEqual([r["image"] for r in records], [p.stem for p in PATHS])
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import textwrap
+import unittest
+from dataclasses import dataclass
+
+from labels.pylib.lazy import LazyClassVar
+
+# Run in a new interpreter, the test suite has already used these tables
+IMPORT_RULES = textwrap.dedent(
+    """
+    from labels.pylib.lazy import LazyClassVar
+    from labels.pylib.rules.admin_unit import AdminUnit
+    from labels.pylib.rules.job import Job
+    from labels.pylib.rules.taxon import Taxon
+
+    for cls in (AdminUnit, Job, Taxon):
+        for name, attr in vars(cls).items():
+            if isinstance(attr, LazyClassVar) and attr.loaded:
+                print(f"{cls.__name__}.{name}")
+    """
+)
+
+
+class TestLazyClassVar(unittest.TestCase):
+    def test_lazy_class_var_on_dataclass(self):
+        built = []
+
+        @dataclass
+        class Table:
+            lookup = LazyClassVar(lambda _cls: built.append("lookup") or {"a": 1})
+            field: int = 0
+
+        self.assertEqual(built, [])
+        self.assertEqual(Table.lookup, {"a": 1})
+        self.assertEqual(Table().lookup, {"a": 1})
+        self.assertEqual(built, ["lookup"])
+
+    def test_importing_rules_builds_no_tables(self):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", IMPORT_RULES],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout, "")
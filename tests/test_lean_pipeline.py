@@ -0,0 +1,24 @@
+import unittest
+from functools import cache
+
+from labels.pylib import pipeline
+from tests import setup
+from tests.equivalence import as_dwc, rule_test_texts
+
+
+@cache
+def lean():
+    """Build the lean pipeline the first time a test needs it."""
+    return pipeline.build(lean=True)
+
+
+class TestLeanPipeline(unittest.TestCase):
+    def test_lean_pipeline_keeps_dwc(self):
+        """Dropping the parser & lemmatizer must not change any output."""
+        for text in rule_test_texts():
+            with self.subTest(text=text):
+                self.assertEqual(as_dwc(lean()(text)), as_dwc(setup.PIPELINE(text)))
+
+    def test_lean_pipeline_excludes_components(self):
+        for name in pipeline.LEAN_EXCLUDE:
+            self.assertNotIn(name, lean().pipe_names)
@@ -0,0 +1,79 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from labels.pylib.label import Label
+from labels.pylib.metrics import Metrics, StageStats
+
+
+class TestMetrics(unittest.TestCase):
+    def test_metrics_summary_shape(self):
+        metrics = Metrics()
+        metrics.add("parse/read", 1.0, 0.5)
+        metrics.add("parse/nlp", 2.0, 2.0, calls=3)
+        metrics.merge({"parse/nlp": StageStats(wall=1.0, cpu=1.0, calls=1)})
+        metrics.add("write/close", 0.25, 0.25)
+        for i in range(3):
+            lb = metrics.start(Label.from_text("text", str(i)))
+            metrics.finish(metrics.enter(lb))
+        metrics.extra["timed_out"] = 0
+
+        summary = metrics.summary()
+
+        self.assertEqual(
+            set(summary),
+            {
+                "wall_seconds",
+                "cpu_seconds",
+                "labels",
+                "labels_per_second",
+                "latency_ms",
+                "queue_wait_ms",
+                "peak_rss_mb",
+                "stages",
+                "timed_out",
+            },
+        )
+        self.assertEqual(summary["labels"], 3)
+        self.assertEqual(set(summary["latency_ms"]), {"p50", "p95", "p99", "max"})
+        self.assertEqual(set(summary["queue_wait_ms"]), {"p50", "p95", "p99", "max"})
+        self.assertEqual(
+            summary["stages"],
+            {
+                "parse": {
+                    "wall": 4.0,
+                    "cpu": 3.5,
+                    "stages": {
+                        "nlp": {"wall": 3.0, "cpu": 3.0, "calls": 4},
+                        "read": {"wall": 1.0, "cpu": 0.5, "calls": 1},
+                    },
+                },
+                "write": {
+                    "wall": 0.25,
+                    "cpu": 0.25,
+                    "stages": {"close": {"wall": 0.25, "cpu": 0.25, "calls": 1}},
+                },
+            },
+        )
+        json.dumps(summary)
+
+    def test_metrics_no_labels(self):
+        summary = Metrics().summary()
+        self.assertEqual(summary["labels"], 0)
+        self.assertEqual(summary["latency_ms"], {})
+        self.assertEqual(summary["stages"], {})
+
+    def test_metrics_snapshots_for_every_label(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "metrics.json"
+            metrics = Metrics(path, every=1e-9)
+            # Labels that are filtered out or time out are finished but not written
+            for i in range(2):
+                lb = metrics.start(Label.from_text("text", str(i)))
+                metrics.finish(metrics.enter(lb))
+            metrics.write()
+
+            snapshots = path.with_suffix(".snapshots.jsonl").read_text().splitlines()
+            self.assertEqual([json.loads(s)["labels"] for s in snapshots], [1, 2])
+            self.assertEqual(json.loads(path.read_text())["labels"], 2)
@@ -0,0 +1,61 @@
+import copy
+import unittest
+from unittest.mock import patch
+
+from labels.pylib import labels as labels_module
+from labels.pylib.label import Label
+from labels.pylib.labels import Labels
+from labels.pylib.metrics import Metrics
+
+
+class FakePool:
+    """Take every shard up front like Pool.imap's feeder thread can."""
+
+    def imap(self, func, iterable):
+        shards = list(iterable)
+        return (func(s) for s in shards)
+
+
+def fake_parse_shard(shard):
+    # Workers get pickled copies of the labels
+    shard = copy.deepcopy(shard)
+    for lb in shard:
+        lb.parsed = True
+        lb.dwc = {"dwc:verbatimLabel": lb.path.stem}
+    return shard, {}
+
+
+class TestParseInParallel(unittest.TestCase):
+    def parse(self, labels: list[Label], batch_size: int) -> list[Label]:
+        parser = object.__new__(Labels)
+        parser.batch_size = batch_size
+        parser.metrics = Metrics()
+        parser.__dict__["pool"] = FakePool()
+        with patch.object(labels_module, "parse_shard", fake_parse_shard):
+            return list(parser.parse_in_parallel(iter(labels)))
+
+    def test_parse_in_parallel_keeps_order(self):
+        labels = [Label.from_text("text", f"label_{i:02d}") for i in range(23)]
+        cached = {0, 1, 5, 6, 7, 8, 12, 22}  # Including whole shards
+        for i in cached:
+            labels[i].cached = True
+            labels[i].dwc = {"cached": True}
+
+        for batch_size in (1, 3, 4, 100):
+            with self.subTest(batch_size=batch_size):
+                results = self.parse(labels, batch_size)
+                self.assertEqual(
+                    [lb.path.stem for lb in results], [lb.path.stem for lb in labels]
+                )
+                for i, lb in enumerate(results):
+                    if i in cached:
+                        self.assertIs(lb, labels[i])
+                    else:
+                        self.assertTrue(lb.parsed)
+                        self.assertEqual(lb.dwc, {"dwc:verbatimLabel": lb.path.stem})
+
+    def test_parse_in_parallel_all_cached(self):
+        labels = [Label.from_text("text", str(i)) for i in range(5)]
+        for lb in labels:
+            lb.cached = True
+        self.assertEqual(self.parse(labels, 2), labels)
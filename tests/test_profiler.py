@@ -0,0 +1,73 @@
+import time
+import unittest
+from types import SimpleNamespace
+
+from labels.pylib.profiler import Profiler
+
+
+class FakeNlp:
+    """Just enough of a Language for Profiler.wrap()."""
+
+    def __init__(self, components):
+        self._components = components
+
+    def get_pipe(self, name):
+        return dict(self._components)[name]
+
+    def __call__(self, doc):
+        for _, proc in self._components:
+            doc = proc(doc)
+        return doc
+
+    def pipe(self, docs):
+        for _, proc in self._components:
+            docs = proc.pipe(docs)
+        return docs
+
+
+def sleeper(seconds: float):
+    def proc(doc):
+        time.sleep(seconds)
+        return doc
+
+    return proc
+
+
+def make_nlp() -> FakeNlp:
+    nlp = FakeNlp([("inner", sleeper(0.01))])
+
+    def repeat(doc):
+        time.sleep(0.01)
+        for _ in range(3):
+            doc = nlp.get_pipe("inner")(doc)
+        return doc
+
+    nlp._components.append(("repeat", repeat))
+    return nlp
+
+
+class TestProfiler(unittest.TestCase):
+    def seconds(self, profiler: Profiler) -> dict[str, float]:
+        return {r["name"]: r["seconds"] for r in profiler.report()}
+
+    def test_profiler_nested_calls_are_exclusive(self):
+        profiler = Profiler()
+        nlp = profiler.wrap(make_nlp())
+        nlp(SimpleNamespace(ents=()))
+
+        seconds = self.seconds(profiler)
+        # inner runs once on its own and three times inside repeat
+        self.assertGreaterEqual(seconds["inner"], 0.04)
+        self.assertLess(seconds["repeat"], 0.02)
+        self.assertAlmostEqual(sum(seconds.values()), 0.05, delta=0.01)
+
+    def test_profiler_pipe_is_exclusive(self):
+        profiler = Profiler()
+        nlp = profiler.wrap(make_nlp())
+        docs = list(nlp.pipe(SimpleNamespace(ents=()) for _ in range(2)))
+
+        self.assertEqual(len(docs), 2)
+        seconds = self.seconds(profiler)
+        self.assertGreaterEqual(seconds["inner"], 0.08)
+        self.assertLess(seconds["repeat"], 0.04)
+        self.assertAlmostEqual(sum(seconds.values()), 0.1, delta=0.02)
@@ -0,0 +1,106 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from labels.pylib.label import Label
+from labels.pylib.metrics import Metrics
+from labels.pylib.result_cache import ResultCache
+
+
+def fake_parser(parsed: list[str]):
+    """Give every label a record and note which ones were sent to the parser."""
+
+    def parser(labels):
+        for lb in labels:
+            if not lb.cached:
+                parsed.append(lb.path.stem)
+                lb.dwc = {"dwc:verbatimLabel": lb.text.upper()}
+                lb.word_count = len(lb.text.split())
+                lb.parsed = True
+            yield lb
+
+    return parser
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+        self.fingerprint = "pipeline 1"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_cache(
+        self, texts: dict[str, str], metrics: Metrics | None = None
+    ) -> tuple[list[Label], list[str]]:
+        with (
+            patch("labels.pylib.pipeline.fingerprint", return_value=self.fingerprint),
+            patch("labels.pylib.vocabulary.fingerprint", return_value="vocabulary"),
+        ):
+            cache = ResultCache(self.cache_dir, metrics=metrics)
+        labels = [Label.from_text(t, s) for s, t in texts.items()]
+        parsed = []
+        results = list(cache.parse(labels, fake_parser(parsed)))
+        cache.db.close()
+        return results, parsed
+
+    def test_result_cache_miss(self):
+        results, parsed = self.run_cache({"a": "one two", "b": "three"})
+        self.assertEqual(parsed, ["a", "b"])
+        self.assertEqual([lb.path.stem for lb in results], ["a", "b"])
+        self.assertFalse(any(lb.cached for lb in results))
+
+    def test_result_cache_hit(self):
+        self.run_cache({"a": "one two", "b": "three"})
+        results, parsed = self.run_cache({"a": "one two", "b": "three"})
+        self.assertEqual(parsed, [])
+        self.assertTrue(all(lb.cached for lb in results))
+        self.assertEqual(results[0].dwc, {"dwc:verbatimLabel": "ONE TWO"})
+        self.assertEqual(results[0].word_count, 2)
+
+    def test_result_cache_keeps_order(self):
+        self.run_cache({"b": "three"})
+        results, parsed = self.run_cache({"a": "one", "b": "three", "c": "four"})
+        self.assertEqual(parsed, ["a", "c"])
+        self.assertEqual([lb.path.stem for lb in results], ["a", "b", "c"])
+
+    def test_result_cache_text_changed(self):
+        self.run_cache({"a": "one two"})
+        results, parsed = self.run_cache({"a": "one two three"})
+        self.assertEqual(parsed, ["a"])
+        self.assertEqual(results[0].dwc, {"dwc:verbatimLabel": "ONE TWO THREE"})
+
+    def test_result_cache_fingerprint_changed(self):
+        self.run_cache({"a": "one two"})
+        self.fingerprint = "pipeline 2"
+        _, parsed = self.run_cache({"a": "one two"})
+        self.assertEqual(parsed, ["a"])
+
+    def test_result_cache_times_dwc(self):
+        self.run_cache({"b": "three"})
+        metrics = Metrics()
+        with patch.object(Label, "as_dwc", autospec=True) as as_dwc:
+            as_dwc.side_effect = lambda lb: lb.dwc
+            self.run_cache({"a": "one", "b": "three", "c": "four"}, metrics)
+        self.assertEqual(as_dwc.call_count, 2)
+        self.assertEqual(metrics.stages["dwc"].calls, 2)
+
+    def test_result_cache_hits_are_not_held(self):
+        with (
+            patch("labels.pylib.pipeline.fingerprint", return_value=self.fingerprint),
+            patch("labels.pylib.vocabulary.fingerprint", return_value="vocabulary"),
+        ):
+            cache = ResultCache(self.cache_dir)
+        first = [Label.from_text(f"label {i}", str(i)) for i in range(3)]
+        list(cache.parse(first, fake_parser([])))
+
+        def labels():
+            yield from (Label.from_text(f"label {i}", str(i)) for i in range(3))
+            msg = "Read past the cache hits"
+            raise AssertionError(msg)
+
+        results = cache.parse(labels(), fake_parser([]))
+        self.assertEqual([next(results).path.stem for _ in range(3)], ["0", "1", "2"])
+        cache.db.close()
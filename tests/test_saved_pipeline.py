@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from labels.pylib import pipeline
+from tests import setup
+from tests.equivalence import as_dwc, rule_test_texts
+
+
+class TestSavedPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.pipeline_dir = Path(cls.temp_dir.name) / "pipeline"
+        pipeline.save(cls.pipeline_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_saved_pipeline_keeps_dwc(self):
+        """A saved & reloaded pipeline must give the same output as a built one."""
+        with patch.object(pipeline, "build", side_effect=AssertionError("Rebuilt")):
+            saved = pipeline.load(self.pipeline_dir)
+        self.assertEqual(saved.pipe_names, setup.PIPELINE.pipe_names)
+        for text in rule_test_texts():
+            with self.subTest(text=text):
+                self.assertEqual(as_dwc(saved(text)), as_dwc(setup.PIPELINE(text)))
+
+    def test_saved_pipeline_stale(self):
+        fingerprint = self.pipeline_dir / pipeline.FINGERPRINT
+        saved = fingerprint.read_text()
+        self.addCleanup(fingerprint.write_text, saved)
+        fingerprint.write_text("stale")
+
+        with (
+            patch.object(pipeline, "build", return_value="built") as build,
+            self.assertLogs(level="WARNING"),
+        ):
+            self.assertEqual(pipeline.load(self.pipeline_dir), "built")
+        build.assert_called_once_with(lean=False)
+
+    def test_saved_pipeline_other_variant(self):
+        with (
+            patch.object(pipeline, "build", return_value="built") as build,
+            self.assertLogs(level="WARNING"),
+        ):
+            self.assertEqual(pipeline.load(self.pipeline_dir, lean=True), "built")
+        build.assert_called_once_with(lean=True)
+
+    def test_saved_pipeline_missing(self):
+        with (
+            patch.object(pipeline, "build", return_value="built"),
+            self.assertLogs(level="WARNING"),
+        ):
+            missing = Path(self.temp_dir.name) / "missing"
+            self.assertEqual(pipeline.load(missing), "built")
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import regex as re
+
+from labels.pylib.score import score_texts, split_words
+from labels.pylib.vocabulary import Vocabulary
+
+
+def baseline_score(text: str, vocabulary: Vocabulary) -> tuple[int, int, float]:
+    """Score a label the way Label.score_label did before batching."""
+    all_words = [t for t in re.split(r"[^\p{L}]+", text.lower()) if t]
+    word_count = len(all_words)
+    valid_words = sum(1 for w in all_words if w in vocabulary)
+    score = 0.0
+    if word_count > 0:
+        score = round(valid_words / word_count, 2)
+    return word_count, valid_words, score
+
+
+class TestScore(unittest.TestCase):
+    def setUp(self):
+        self.vocabulary = Vocabulary(Path(tempfile.gettempdir()))
+        self.vocabulary.words = np.array([b"good", b"plant"], dtype=np.bytes_)
+
+    def test_score_texts_matches_baseline(self):
+        ratios = [(v, c) for c in range(1, 61) for v in range(c + 1)]
+        ratios += [(1, 40), (139, 200), (0, 0)]
+        texts = [" ".join(["good"] * v + ["bad"] * (c - v)) for v, c in ratios]
+        texts += ["Good plant, 12 bad-words.", "123 456", "♂ ♀", ""]
+
+        word_count, valid_words, score = score_texts(texts, self.vocabulary)
+
+        for i, text in enumerate(texts):
+            actual = (int(word_count[i]), int(valid_words[i]), float(score[i]))
+            self.assertEqual(actual, baseline_score(text, self.vocabulary), text)
+
+    def test_score_texts_rounding(self):
+        texts = [" ".join(["good"] + ["bad"] * 39)]
+        texts += [" ".join(["good"] * 139 + ["bad"] * 61)]
+        _, _, score = score_texts(texts, self.vocabulary)
+        self.assertEqual(score.tolist(), [0.03, 0.69])
+
+    def test_vocabulary_ids_long_words(self):
+        words = ["good", "x" * 5000, "plant", "bad", "goodness"]
+        ids = self.vocabulary.ids(words)
+        self.assertEqual(ids.tolist(), [0, -1, 1, -1, -1])
+        self.assertEqual(self.vocabulary.ids(["x" * 5000]).tolist(), [-1])
+        self.assertEqual(
+            score_texts([" ".join(words)], self.vocabulary)[1].tolist(),
+            [len([w for w in split_words(" ".join(words)) if w in self.vocabulary])],
+        )
@@ -0,0 +1,86 @@
+import json
+import threading
+import unittest
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer
+
+from labels.serve_labels import Handler
+
+
+class FakeParser:
+    """Stands in for LabelParser so that no pipeline is loaded."""
+
+    def parse(self, request: dict) -> dict:
+        if request["text"] == "crash":
+            msg = "Something broke"
+            raise RuntimeError(msg)
+        if request["text"] == "key error":
+            raise KeyError(request["text"])
+        return {"image": request.get("image", "label"), "text": request["text"]}
+
+
+class TestServeLabels(unittest.TestCase):
+    def setUp(self):
+        Handler.parser = FakeParser()
+        self.addCleanup(setattr, Handler, "parser", None)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def request(self, method: str, path: str, body=None) -> tuple[int, dict]:
+        conn = HTTPConnection(*self.server.server_address)
+        self.addCleanup(conn.close)
+        data = body if isinstance(body, str | None) else json.dumps(body)
+        conn.request(method, path, body=data)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_serve_health(self):
+        self.assertEqual(self.request("GET", "/health"), (200, {"status": "ok"}))
+
+    def test_serve_parse(self):
+        status, result = self.request("POST", "/parse", {"text": "Quercus alba"})
+        self.assertEqual(status, 200)
+        self.assertEqual(result, {"image": "label", "text": "Quercus alba"})
+
+    def test_serve_parse_list(self):
+        body = [{"text": "one", "image": "a"}, {"text": "two", "image": "b"}]
+        status, result = self.request("POST", "/parse", body)
+        self.assertEqual(status, 200)
+        self.assertEqual([r["image"] for r in result], ["a", "b"])
+
+    def test_serve_bad_request(self):
+        status, result = self.request("POST", "/parse", "{not json")
+        self.assertEqual(status, 400)
+        self.assertIn("error", result)
+
+        bad = [
+            {"image": "no text"},
+            {"text": 5},
+            {"text": "x", "image": 5},
+            ["not an object"],
+            [{"text": "fine"}, {"image": "no text"}],
+            "a string",
+        ]
+        for body in bad:
+            with self.subTest(body=body):
+                status, result = self.request("POST", "/parse", json.dumps(body))
+                self.assertEqual(status, 400)
+                self.assertIn("error", result)
+
+    def test_serve_parse_failed(self):
+        status, result = self.request("POST", "/parse", {"text": "crash"})
+        self.assertEqual(status, 500)
+        self.assertEqual(result, {"error": "Parse failed: Something broke"})
+
+        # The server keeps going
+        status, _ = self.request("POST", "/parse", {"text": "fine"})
+        self.assertEqual(status, 200)
+
+    def test_serve_parse_key_error(self):
+        """Errors from inside the parser are server errors, not bad requests."""
+        status, result = self.request("POST", "/parse", {"text": "key error"})
+        self.assertEqual(status, 500)
+        self.assertEqual(result, {"error": "Parse failed: 'key error'"})
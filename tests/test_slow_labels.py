@@ -0,0 +1,34 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from labels.pylib.label import Label
+from labels.pylib.slow_labels import SlowLabels
+
+
+def timed_label(stem: str, seconds: float) -> Label:
+    lb = Label.from_text("text", stem)
+    lb.parse_seconds = seconds
+    lb.token_count = 10
+    lb.component_seconds = {"tokenizer": seconds / 4, "taxon": seconds / 2}
+    return lb
+
+
+class TestSlowLabels(unittest.TestCase):
+    def test_slow_labels_keeps_slowest(self):
+        slow = SlowLabels(2)
+        for stem, seconds in [("a", 0.1), ("b", 0.4), ("c", 0.0), ("d", 0.2)]:
+            slow.add(timed_label(stem, seconds))
+        report = slow.report()
+        self.assertEqual([r["stem"] for r in report], ["b", "d"])
+        self.assertEqual(list(report[0]["components"]), ["taxon", "tokenizer"])
+
+    def test_slow_labels_write(self):
+        slow = SlowLabels(3)
+        slow.add(timed_label("a", 0.1))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "slow.json"
+            slow.write(path)
+            self.assertEqual(json.loads(path.read_text()), slow.report())
+            self.assertIn("a", path.with_suffix(".txt").read_text())
@@ -0,0 +1,113 @@
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from labels.pylib.text_sources import (
+    CsvSource,
+    JsonlSource,
+    TarSource,
+    TextSource,
+    ZipSource,
+    text_source,
+)
+
+TEXTS = {"b": "Quercus alba", "a": "Ünïcode ♀ label", "c": ""}
+
+
+class TestTextSources(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_all(self, source: TextSource) -> dict[str, str]:
+        return {n.stem: source.read(n) for n in source.names()}
+
+    def test_text_source_is_abstract(self):
+        with self.assertRaises(TypeError):  # noqa: PT027
+            TextSource(self.dir)
+
+    def test_text_source_dir(self):
+        self.assertIsNone(text_source(self.dir))
+        with self.assertRaises(ValueError):  # noqa: PT027
+            text_source(self.dir / "labels.rar")
+
+    def test_zip_source(self):
+        path = self.dir / "labels.zip"
+        with zipfile.ZipFile(path, "w") as z:
+            for stem, text in TEXTS.items():
+                z.writestr(f"texts/{stem}.txt", text)
+            z.writestr("texts/readme.md", "Not a label")
+        source = text_source(path)
+        self.assertIsInstance(source, ZipSource)
+        self.assertEqual([n.stem for n in source.names()], ["a", "b", "c"])
+        self.assertEqual(self.read_all(source), TEXTS)
+
+    def test_tar_source(self):
+        path = self.dir / "labels.tar"
+        with tarfile.open(path, "w") as tar:
+            for stem, text in TEXTS.items():
+                data = text.encode()
+                info = tarfile.TarInfo(f"texts/{stem}.txt")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        source = text_source(path)
+        self.assertIsInstance(source, TarSource)
+        self.assertEqual([n.stem for n in source.names()], ["a", "b", "c"])
+        self.assertEqual(self.read_all(source), TEXTS)
+
+    def test_jsonl_source(self):
+        path = self.dir / "labels.jsonl"
+        lines = [json.dumps({"stem": s, "text": t}) for s, t in TEXTS.items()]
+        path.write_text("\n".join(lines[:2]) + "\n\n" + lines[2] + "\n")
+        source = text_source(path)
+        self.assertIsInstance(source, JsonlSource)
+        self.assertEqual([n.stem for n in source.names()], ["b", "a", "c"])
+        self.assertEqual(self.read_all(source), TEXTS)
+
+    def test_jsonl_source_repeated_stem(self):
+        path = self.dir / "labels.jsonl"
+        lines = [json.dumps({"stem": "a", "text": t}) for t in ("one", "two")]
+        path.write_text("\n".join(lines) + "\n")
+        with self.assertRaises(ValueError):  # noqa: PT027
+            JsonlSource(path).names()
+
+    def test_csv_source(self):
+        (self.dir / "texts").mkdir()
+        for stem, text in TEXTS.items():
+            (self.dir / "texts" / f"{stem}.txt").write_text(text)
+        path = self.dir / "labels.csv"
+        rows = [f"texts/{s}.txt" for s in TEXTS]
+        path.write_text("path\n" + "\n".join(rows) + "\n")
+        source = text_source(path)
+        self.assertIsInstance(source, CsvSource)
+        self.assertEqual([n.stem for n in source.names()], ["b", "a", "c"])
+        self.assertEqual(self.read_all(source), TEXTS)
+
+    def test_zip_source_repeated_stem(self):
+        path = self.dir / "labels.zip"
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("batch1/x.txt", "one")
+            z.writestr("batch2/x.txt", "two")
+        with self.assertRaises(ValueError):  # noqa: PT027
+            text_source(path).names()
+
+    def test_zip_source_resource_forks(self):
+        path = self.dir / "labels.zip"
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("texts/x.txt", "one")
+            z.writestr("__MACOSX/texts/._x.txt", "fork")
+            z.writestr("texts/._y.txt", "fork")
+        self.assertEqual(text_source(path).names(), [Path("texts/x.txt")])
+
+    def test_csv_source_repeated_stem(self):
+        path = self.dir / "labels.csv"
+        path.write_text("path\nbatch1/x.txt\nbatch2/x.txt\n")
+        with self.assertRaises(ValueError):  # noqa: PT027
+            text_source(path).names()
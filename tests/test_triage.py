@@ -0,0 +1,69 @@
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from labels.pylib import pipeline
+from labels.pylib.triage import Triage, group_triggers
+from tests import setup
+from tests.equivalence import as_dwc, rule_test_texts
+
+TERMS = {
+    Path("sex_terms.csv"): [
+        {"pattern": "staminate"},
+        {"pattern": "♂"},
+        {"pattern": "♀ "},
+    ],
+    Path("punct_terms.csv"): [{"pattern": "+/-"}, {"pattern": "leaf"}],
+}
+
+
+class SexRule:
+    terms = Path("sex_terms.csv")
+
+
+class PunctRule:
+    terms = Path("punct_terms.csv")
+
+
+class TestTriage(unittest.TestCase):
+    def test_triage_keeps_dwc(self):
+        """Skipping trait groups must not change any output."""
+        triage = Triage(setup.PIPELINE)
+        for text in rule_test_texts():
+            disable = triage.disable(triage.route(text))
+            with self.subTest(text=text):
+                self.assertEqual(
+                    as_dwc(setup.PIPELINE(text, disable=disable)),
+                    as_dwc(setup.PIPELINE(text)),
+                )
+
+
+class TestTriageSymbols(unittest.TestCase):
+    def setUp(self):
+        group_triggers.cache_clear()
+        rules = {"sex": [SexRule], "punct": [PunctRule]}
+        patches = [
+            patch("labels.pylib.triage.GROUP_RULES", rules),
+            patch("labels.pylib.triage.term_util.read_terms", TERMS.get),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(group_triggers.cache_clear)
+        nlp = SimpleNamespace(meta={pipeline.TRAIT_GROUPS: {"sex": [], "punct": []}})
+        self.triage = Triage(nlp)
+
+    def test_triage_symbol_terms(self):
+        self.assertEqual(
+            group_triggers("sex"), (frozenset({"staminate"}), frozenset({"♂", "♀"}))
+        )
+        self.assertNotIn("sex", self.triage.route("Flowers ♂, white"))
+        self.assertNotIn("sex", self.triage.route("Flowers♀"))
+        self.assertNotIn("sex", self.triage.route("Staminate flowers"))
+        self.assertIn("sex", self.triage.route("Flowers white"))
+
+    def test_triage_punctuation_terms(self):
+        self.assertNotIn("punct", self.triage.route("Petals +/- hairy"))
+        self.assertNotIn("punct", self.triage.route("Leaf hairy"))
+        self.assertIn("punct", self.triage.route("Petals hairy"))
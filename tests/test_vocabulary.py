@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from labels.pylib import vocabulary
+from labels.pylib.vocabulary import INDEX, Vocabulary
+
+
+class TestVocabulary(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_vocabulary_sources_are_data_files(self):
+        package = self.dir / "spell_well"
+        (package / "pylib" / "__pycache__").mkdir(parents=True)
+        for name in ("vocab.db", "pylib/__init__.py", "pylib/__pycache__/x.pyc"):
+            (package / name).touch()
+
+        spec = SimpleNamespace(submodule_search_locations=[str(package)])
+        with patch("importlib.util.find_spec", return_value=spec):
+            paths = vocabulary.sources()
+
+        terms = [vocabulary.BINOMIAL_TERMS, vocabulary.MONOMIAL_TERMS]
+        self.assertEqual(paths, [package / "vocab.db", *terms])
+
+    def test_vocabulary_checked_skips_staleness(self):
+        np.save(self.dir / INDEX, np.array([b"good"], dtype=np.bytes_))
+        with patch.object(Vocabulary, "is_stale", side_effect=AssertionError):
+            words = Vocabulary(self.dir, checked=True)
+            self.assertIn("good", words)
@@ -0,0 +1,109 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from labels.pylib.label import Label
+from labels.pylib.writers.json_writer import JsonLinesWriter, JsonWriter
+from labels.pylib.writers.parquet_writer import (
+    OTHER_TERMS,
+    SCHEMA,
+    ParquetWriter,
+    read_parquet,
+)
+
+
+def make_labels() -> list[Label]:
+    dwc = [
+        {"dwc:scientificName": "Quercus alba", "dwc:county": "Leon"},
+        {
+            "dwc:recordNumber": "4342",
+            "dwc:dynamicProperties": {"verifier": "John Kinsman"},
+        },
+        {"dwc:country": "USA", "dwc:notADwcTerm": "x"},
+    ]
+    labels = []
+    for i, d in enumerate(dwc):
+        lb = Label.from_text(f"label {i}", f"label_{i}")
+        lb.dwc = d
+        lb.word_count, lb.valid_words, lb.score = 2, 1, 0.5
+        labels.append(lb)
+    return labels
+
+
+class TestWriters(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parquet_writer(self):
+        path = self.dir / "labels.parquet"
+        writer = ParquetWriter(path, row_group=2)
+        for lb in make_labels():
+            writer.write(lb)
+        writer.close()
+
+        file = pq.ParquetFile(path)
+        self.assertEqual(file.schema_arrow, SCHEMA)
+        self.assertEqual(file.num_row_groups, 2)
+
+        df = read_parquet(path)
+        self.assertEqual(df["image"].tolist(), ["label_0", "label_1", "label_2"])
+        self.assertEqual(df["score"].tolist(), [0.5, 0.5, 0.5])
+        self.assertEqual(df.loc[0, "dwc:scientificName"], "Quercus alba")
+        self.assertEqual(
+            json.loads(df.loc[1, "dwc:dynamicProperties"]),
+            {"verifier": "John Kinsman"},
+        )
+        self.assertEqual(json.loads(df.loc[2, OTHER_TERMS]), {"dwc:notADwcTerm": "x"})
+        self.assertNotIn("dwc:habitat", df.columns)
+
+    def test_parquet_writer_no_labels(self):
+        path = self.dir / "labels.parquet"
+        ParquetWriter(path).close()
+        self.assertEqual(pq.read_table(path).num_rows, 0)
+
+    def test_json_writer(self):
+        path = self.dir / "labels.json"
+        writer = JsonWriter(path)
+        for lb in make_labels():
+            writer.write(lb)
+        writer.close()
+        records = json.loads(path.read_text())
+        stems = [r["image"] for r in records]
+        self.assertEqual(stems, ["label_0", "label_1", "label_2"])
+        self.assertEqual(records[0]["dwc:county"], "Leon")
+
+    def test_json_writer_keeps_old_output(self):
+        path = self.dir / "labels.json"
+        path.write_text("[]")
+        writer = JsonWriter(path)
+        writer.write(make_labels()[0])
+        self.assertEqual(path.read_text(), "[]")  # Until it is closed
+        writer.close()
+        self.assertEqual(len(json.loads(path.read_text())), 1)
+        self.assertEqual(list(self.dir.iterdir()), [path])
+
+    def test_json_lines_writer_resumes(self):
+        path = self.dir / "labels.jsonl"
+        labels = make_labels()
+        writer = JsonLinesWriter(path)
+        writer.write(labels[0])
+        writer.close()
+        with path.open("a") as f:
+            f.write('{"image": "label_1", "wor')  # Cut off by a crash
+
+        writer = JsonLinesWriter(path)
+        self.assertEqual(writer.done, {"label_0"})
+        for lb in labels[1:]:
+            writer.write(lb)
+        writer.close()
+
+        with path.open() as f:
+            stems = [json.loads(ln)["image"] for ln in f]
+        self.assertEqual(stems, ["label_0", "label_1", "label_2"])